@@ -1,15 +1,94 @@
-import json
 import base64
 import gzip
+import zlib
 import boto3
+from botocore.config import Config
 import os
-from datetime import datetime
+import resource
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
 import logging
 
+try:
+    import orjson as _json
+except ImportError:
+    import json as _json
+
+try:
+    import simdjson
+    # Module-level parser reuses its internal buffers across warm invocations
+    _simdjson_parser = simdjson.Parser()
+except ImportError:
+    _simdjson_parser = None
+
+_ANALYTICS_MARKER = b'MCP_ANALYTICS'
+
+# Objects are partitioned by the UTC hour of their events: logs/YYYY/MM/DD/HH/xxx.txt.gz
+S3_PARTITION_FORMAT = 'logs/%Y/%m/%d/%H/'
+S3_OBJECT_FORMAT = '%Y%m%d_%H%M%S_%f.txt.gz'
+
+_MS_PER_HOUR = 3600 * 1000
+
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
-s3_client = boto3.client('s3')
+# Keep-alive connections are reused across warm invocations; virtual-hosted
+# addressing avoids the path-style redirect hop
+s3_client = boto3.client(
+    's3',
+    config=Config(
+        tcp_keepalive=True,
+        max_pool_connections=8,
+        retries={'mode': 'standard', 'max_attempts': 3},
+        s3={'addressing_style': 'virtual'}
+    )
+)
+
+# Background workers for S3 uploads so PUTs overlap each other and the rest of the
+# handler; boto3 releases the GIL while waiting on the socket
+_upload_executor = ThreadPoolExecutor(max_workers=8)
+
+# Upper bound on waiting for an S3 upload before returning (Lambda timeout is 300s)
+S3_UPLOAD_TIMEOUT_SECONDS = 60
+
+# Warm containers can buffer lines across invocations and write them as one object once
+# either threshold is reached. The default of 0 lines flushes on every invocation, since
+# lines still buffered when Lambda reclaims the container are lost.
+LOG_BUFFER_MAX_LINES = int(os.environ.get('LOG_BUFFER_MAX_LINES', '0'))
+LOG_BUFFER_MAX_AGE_SECONDS = float(os.environ.get('LOG_BUFFER_MAX_AGE_SECONDS', '30'))
+
+_log_buffer = []
+_last_flush = time.monotonic()
+
+# Warn when peak RSS crosses this fraction of the configured memory size (MemorySize)
+MEMORY_WARNING_RATIO = 0.8
+
+def _dumps(obj):
+    """Serialize obj to a JSON str (API Gateway/Lambda bodies must be str, not bytes)"""
+    body = _json.dumps(obj)
+    return body.decode('utf-8') if isinstance(body, bytes) else body
+
+def _take_buffered_lines():
+    """Drain the cross-invocation buffer if a flush threshold is reached, else return []"""
+    global _log_buffer, _last_flush
+    now = time.monotonic()
+    if len(_log_buffer) < LOG_BUFFER_MAX_LINES and now - _last_flush < LOG_BUFFER_MAX_AGE_SECONDS:
+        return []
+    
+    log_lines, _log_buffer = _log_buffer, []
+    _last_flush = now
+    return log_lines
+
+def _log_peak_memory(context):
+    """Log peak RSS for memory tuning and warn when it nears the function's memory limit"""
+    # ru_maxrss is reported in KiB on Linux
+    max_rss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    memory_limit_mb = getattr(context, 'memory_limit_in_mb', None)
+    if memory_limit_mb and max_rss_mb > int(memory_limit_mb) * MEMORY_WARNING_RATIO:
+        logger.warning(f"Peak RSS {max_rss_mb:.1f} MB is above {MEMORY_WARNING_RATIO:.0%} of the {memory_limit_mb} MB limit")
+    else:
+        logger.info(f"Peak RSS {max_rss_mb:.1f} MB")
 
 def lambda_handler(event, context):
     """
@@ -20,36 +99,38 @@ def lambda_handler(event, context):
     processed_records = 0
     failed_records = 0
     
-    # Collect log lines to batch write to S3
-    log_lines = []
-    
     try:
         # Decode CloudWatch Logs data from Subscription Filter
         compressed_data = base64.b64decode(event['awslogs']['data'])
-        log_data = gzip.decompress(compressed_data).decode('utf-8')
-        log_json = json.loads(log_data)
+        # Decompress in one zlib call (no GzipFile/BytesIO layers; wbits=31 selects the
+        # gzip container, and truncated or corrupt payloads still raise) and hand the
+        # UTF-8 bytes straight to the parser
+        log_lines = collect_log_lines(zlib.decompress(compressed_data, wbits=31))
+        processed_records = len(log_lines)
         
-        # Process CloudWatch log events
-        if 'logEvents' in log_json:
-            for log_event in log_json['logEvents']:
-                try:
-                    log_line = process_log_event(log_event)
-                    if log_line:
-                        log_lines.append(log_line)
-                        processed_records += 1
-                except Exception as e:
-                    logger.error(f"Error processing log event: {str(e)}")
-                    failed_records += 1
+        # Buffer lines and write any due batch to S3 in the background, one object per hour
+        _log_buffer.extend(log_lines)
+        uploads = [
+            (_upload_executor.submit(write_logs_to_s3, lines, s3_bucket, hour), len(lines))
+            for hour, lines in partition_log_lines(_take_buffered_lines()).items()
+        ]
         
-        # Write batched log lines to S3
-        if log_lines:
-            write_logs_to_s3(log_lines, s3_bucket)
+        # Wait for the uploads before returning; lines in failed or timed-out uploads
+        # are counted as failed and fail the invocation
+        for upload, line_count in uploads:
+            try:
+                upload.result(timeout=S3_UPLOAD_TIMEOUT_SECONDS)
+            except Exception as e:
+                logger.error(f"S3 upload of {line_count} log lines failed: {e!r}")
+                failed_records += line_count
                 
         logger.info(f"Processed {processed_records} records successfully, {failed_records} failed")
         
+        _log_peak_memory(context)
+        
         return {
-            'statusCode': 200,
-            'body': json.dumps({
+            'statusCode': 500 if failed_records else 200,
+            'body': _dumps({
                 'processed': processed_records,
                 'failed': failed_records
             })
@@ -59,41 +140,61 @@ def lambda_handler(event, context):
         logger.error(f"Error in lambda_handler: {str(e)}")
         return {
             'statusCode': 500,
-            'body': json.dumps({'error': str(e)})
+            'body': _dumps({'error': str(e)})
         }
 
-def process_log_event(log_event):
-    """Process a single log event and return it in the exact format from log.txt"""
-    try:
-        message = log_event.get('message', '')
-        
-        # Only process MCP_ANALYTICS messages
-        if 'MCP_ANALYTICS' not in message:
-            return None
-        
-        # Return the message stripped of whitespace
-        return message.strip()
-        
-    except Exception as e:
-        logger.error(f"Error processing log event: {str(e)}")
-        return None
+def collect_log_lines(log_bytes):
+    """Parse a decompressed CloudWatch payload and return (hour, line) pairs for its MCP_ANALYTICS lines
+
+    hour is the event timestamp in whole hours since the epoch (UTC) and line is the
+    message stripped of surrounding whitespace.
+    """
+    # A single byte scan rules out payloads with nothing to keep (e.g. CONTROL_MESSAGE
+    # batches) without paying for a JSON parse
+    if _ANALYTICS_MARKER not in log_bytes:
+        return []
+    
+    if _simdjson_parser is not None:
+        # simdjson materializes only the fields we touch; the parsed document must not
+        # outlive this call or the shared parser cannot be reused on the next invocation
+        log_json = _simdjson_parser.parse(log_bytes)
+    else:
+        log_json = _json.loads(log_bytes)
+    
+    # Only MCP_ANALYTICS messages are kept; events without a timestamp fall into the current hour
+    now_ms = int(time.time() * 1000)
+    return [
+        ((log_event.get('timestamp') or now_ms) // _MS_PER_HOUR, message.strip())
+        for log_event in log_json.get('logEvents', ())
+        if 'MCP_ANALYTICS' in (message := log_event.get('message', ''))
+    ]
+
+def partition_log_lines(log_lines):
+    """Group (hour, line) pairs into {hour: [line, ...]}"""
+    partitions = {}
+    for hour, line in log_lines:
+        partitions.setdefault(hour, []).append(line)
+    return partitions
 
-def write_logs_to_s3(log_lines, s3_bucket):
-    """Write log lines to S3 with the expected key format: logs/YYYY/MM/DD/HH/xxx.txt"""
+def write_logs_to_s3(log_lines, s3_bucket, hour):
+    """Write one hour's log lines to S3 with the expected key format: logs/YYYY/MM/DD/HH/xxx.txt.gz"""
     try:
-        # Create content from log lines with proper line separation, filtering empty lines
-        content = '\n'.join(line for line in log_lines if line.strip())
+        # Lines arrive stripped and non-empty from collect_log_lines; encode them
+        # straight into a single bytes body instead of joining a str first
+        content = b'\n'.join(line.encode('utf-8') for line in log_lines)
         
-        # Generate S3 key with the expected format: logs/YYYY/MM/DD/HH/xxx.txt
-        now = datetime.utcnow()
-        s3_key = f"logs/{now.year}/{now.month:02d}/{now.day:02d}/{now.hour:02d}/{now.strftime('%Y%m%d_%H%M%S_%f')}.txt"
+        # Generate S3 key under the events' hour partition, named by upload time
+        partition = datetime.fromtimestamp(hour * 3600, timezone.utc)
+        s3_key = partition.strftime(S3_PARTITION_FORMAT) + datetime.now(timezone.utc).strftime(S3_OBJECT_FORMAT)
         
-        # Write to S3 (uncompressed .txt file)
+        # Write to S3 as gzip (the Glue table reads compressionType=gzip); level 1
+        # gets most of the ratio on log text at a fraction of the CPU cost
         s3_client.put_object(
             Bucket=s3_bucket,
             Key=s3_key,
-            Body=content.encode('utf-8'),
-            ContentType='text/plain'
+            Body=gzip.compress(content, compresslevel=1),
+            ContentType='text/plain',
+            ContentEncoding='gzip'
         )
         
         logger.info(f"Wrote {len(log_lines)} log lines to s3://{s3_bucket}/{s3_key}")
@@ -1,8 +1,11 @@
+from functools import lru_cache
+
 from awslabs.mcp_lambda_handler import MCPLambdaHandler
 from loguru import logger
 
 from src.context import set_api_key
 from src.decorators import setup_custom_tool_decorator
+from src.integration import flush_decisions
 from src.oauth import (
     handle_authorization_request,
     handle_metadata_discovery,
@@ -19,6 +22,14 @@ from src.utils import (
     parse_tool_categories_from_request,
 )
 
+# OAuth 2.1 endpoints served before token validation, keyed by request path
+OAUTH_ROUTES = {
+    "/.well-known/oauth-authorization-server": handle_metadata_discovery,
+    "/authorize": handle_authorization_request,
+    "/token": handle_token_request,
+    "/register": handle_registration_request,
+}
+
 
 def create_mcp_handler_for_categories(categories: list[str] | None) -> MCPLambdaHandler:
     """Create and configure MCP handler for specific tool categories."""
@@ -42,6 +53,12 @@ def create_mcp_handler_for_categories(categories: list[str] | None) -> MCPLambda
     return mcp
 
 
+@lru_cache(maxsize=32)
+def get_mcp_handler_for_categories(categories: tuple[str, ...] | None) -> MCPLambdaHandler:
+    """Return a cached MCP handler for the category set, reused across warm invocations."""
+    return create_mcp_handler_for_categories(list(categories) if categories else None)
+
+
 def lambda_handler(event, context):
     """AWS Lambda handler function."""
     # Log incoming request details
@@ -57,14 +74,9 @@ def lambda_handler(event, context):
     logger.info(f"Body: {body}")
 
     # Handle OAuth 2.1 endpoints first (before token validation)
-    if path == "/.well-known/oauth-authorization-server":
-        return handle_metadata_discovery(event)
-    elif path == "/authorize":
-        return handle_authorization_request(event)
-    elif path == "/token":
-        return handle_token_request(event)
-    elif path == "/register":
-        return handle_registration_request(event)
+    oauth_handler = OAUTH_ROUTES.get(path)
+    if oauth_handler:
+        return oauth_handler(event)
 
     # Extract Bearer token from Authorization header
     token = parse_token_from_request(event)
@@ -94,15 +106,19 @@ def lambda_handler(event, context):
     # Parse tool categories from request path or query parameters
     categories = parse_tool_categories_from_request(event)
 
-    # Check if this is an OpenAI Actions request
-    if path.startswith("/openai"):
-        response = handle_openai_request(event, categories)
-        if response:
-            return response
+    try:
+        # Check if this is an OpenAI Actions request
+        if path.startswith("/openai"):
+            response = handle_openai_request(event, categories)
+            if response:
+                return response
 
-    # Handle MCP requests
+        # Handle MCP requests
 
-    # Create MCP handler with appropriate tools
-    mcp = create_mcp_handler_for_categories(categories)
+        # Get MCP handler with appropriate tools (registered once per category set)
+        mcp = get_mcp_handler_for_categories(tuple(categories) if categories else None)
 
-    return mcp.handle_request(event, context)
+        return mcp.handle_request(event, context)
+    finally:
+        # Log buffered output decisions before Lambda freezes the environment
+        flush_decisions()
@@ -1,13 +1,19 @@
 import asyncio
+import atexit
 import csv
 import io
-import json
+import itertools
 import os
-from datetime import UTC, datetime
+import threading
+import time
+from collections.abc import Coroutine
+from functools import lru_cache
+from typing import Any
 
 import httpx
+import orjson
 
-from src.context import get_api_key
+from src.context import get_default_params
 from src.integration.helpers import (
     create_file_reference_response,
     create_inline_response,
@@ -23,6 +29,86 @@ API_BASE_URL = "https://www.alphavantage.co/query"
 # Used as fallback when MCP_OUTPUT_DIR is not configured
 MAX_RESPONSE_TOKENS = int(os.environ.get("MAX_RESPONSE_TOKENS", "50000"))
 
+# Shared HTTP client so tool calls reuse warm keep-alive TLS connections to Alpha Vantage
+# instead of paying a new handshake per request (httpx.Client is thread-safe)
+_http_client = httpx.Client(
+    limits=httpx.Limits(max_keepalive_connections=20, max_connections=100),
+    timeout=httpx.Timeout(30.0),
+)
+atexit.register(_http_client.close)
+
+
+# Per-process sequence for output filenames; with the epoch second and pid it keeps
+# names unique under concurrent requests (a 1-second timestamp alone collides)
+_file_counter = itertools.count()
+
+# Long-lived event loop for OutputHandler's async writes. _make_api_request is
+# synchronous but may be called from a thread that already runs a loop (stdio MCP
+# server), where asyncio.run() raises; a dedicated loop thread works in both cases
+# and avoids creating and tearing down a loop per file write.
+_background_loop: asyncio.AbstractEventLoop | None = None
+_background_loop_lock = threading.Lock()
+
+
+def _run_coroutine(coro: Coroutine[Any, Any, Any]) -> Any:
+    """
+    Run a coroutine to completion on the shared background event loop.
+
+    Args:
+        coro: Coroutine to run.
+
+    Returns:
+        The coroutine's result (exceptions are re-raised in the caller).
+    """
+    global _background_loop
+    with _background_loop_lock:
+        if _background_loop is None:
+            loop = asyncio.new_event_loop()
+            threading.Thread(target=loop.run_forever, name="output-writer", daemon=True).start()
+            _background_loop = loop
+    return asyncio.run_coroutine_threadsafe(coro, _background_loop).result()
+
+
+@lru_cache(maxsize=1)
+def _build_output_components(output_dir: str | None) -> tuple[OutputConfig, OutputHandler]:
+    """
+    Build the Sprint 1 output configuration and handler once per MCP_OUTPUT_DIR value.
+
+    OutputConfig re-reads the environment and creates/permission-checks the output
+    directory, so it is built once and reused until MCP_OUTPUT_DIR changes; changes
+    to the other MCP_OUTPUT_* variables after that are not picked up. Failures
+    raise and so are not cached.
+
+    Args:
+        output_dir: Current MCP_OUTPUT_DIR value (the cache key).
+
+    Returns:
+        Tuple of (config, handler).
+    """
+    config = OutputConfig()
+    return config, OutputHandler(config)
+
+
+def _load_output_config(output_dir: str | None) -> tuple[OutputConfig | None, OutputHandler | None]:
+    """
+    Load the cached Sprint 1 output configuration and handler.
+
+    A failed load is retried on the next request, so output that is
+    misconfigured at first (e.g. the directory is not created yet) starts
+    working once the problem is fixed.
+
+    Args:
+        output_dir: Current MCP_OUTPUT_DIR value.
+
+    Returns:
+        Tuple of (config, handler), or (None, None) if MCP_OUTPUT_DIR is not
+        configured or invalid.
+    """
+    try:
+        return _build_output_components(output_dir)
+    except Exception:
+        return None, None
+
 
 def _parse_csv_to_dicts(csv_string: str) -> list[dict]:
     """
@@ -38,8 +124,14 @@ def _parse_csv_to_dicts(csv_string: str) -> list[dict]:
         ValueError: If CSV parsing fails.
     """
     try:
-        reader = csv.DictReader(io.StringIO(csv_string))
-        return list(reader)
+        # csv.reader + zip over a fixed header tuple avoids DictReader's per-row
+        # bookkeeping; blank lines are skipped as DictReader does
+        reader = csv.reader(io.StringIO(csv_string))
+        headers = next(reader, None)
+        if headers is None:
+            return []
+        headers = tuple(headers)
+        return [dict(zip(headers, row, strict=False)) for row in reader if row]
     except Exception as e:
         raise ValueError(f"Failed to parse CSV response: {e}") from e
 
@@ -58,22 +150,60 @@ def _parse_json_response(json_string: str) -> dict | list:
         ValueError: If JSON parsing fails.
     """
     try:
-        return json.loads(json_string)
-    except json.JSONDecodeError as e:
+        return orjson.loads(json_string)
+    except orjson.JSONDecodeError as e:
         raise ValueError(f"Failed to parse JSON response: {e}") from e
 
 
+def _parse_json_or_text(json_string: str) -> dict | list | str:
+    """
+    Parse JSON string, returning the raw text if it is not valid JSON.
+
+    Alpha Vantage answers some datatype=json requests with plain-text notices,
+    which are passed through unchanged.
+
+    Args:
+        json_string: Response body expected to be JSON.
+
+    Returns:
+        Parsed JSON data, or json_string itself if parsing fails.
+    """
+    try:
+        return _parse_json_response(json_string)
+    except ValueError:
+        return json_string
+
+
+# Endpoints whose responses are a few KB at most (single quote, rate, status or
+# company profile), so they are always returned inline without token estimation
+# unless force_file is set
+_ALWAYS_INLINE = frozenset(
+    {
+        "GLOBAL_QUOTE",
+        "CURRENCY_EXCHANGE_RATE",
+        "MARKET_STATUS",
+        "OVERVIEW",
+        "SYMBOL_SEARCH",
+    }
+)
+
+# Response parser per datatype (anything that is not csv is treated as json)
+_PARSERS = {"csv": _parse_csv_to_dicts, "json": _parse_json_or_text}
+
+
 def _create_preview(
     response_text: str, datatype: str, estimated_tokens: int, error: str = None
 ) -> dict:
     """Create preview data for large responses (R2 fallback)."""
-    lines = response_text.split("\n")
+    # Only split off the first 50 lines; counting newlines avoids building a list
+    # of every line in a response that is, by definition, large
+    sample_lines = response_text.split("\n", 50)[:50]
     preview = {
         "preview": True,
         "data_type": datatype,
-        "total_lines": len(lines),
-        "sample_data": "\n".join(lines[:50]),  # First 50 lines
-        "headers": lines[0] if lines else None,
+        "total_lines": response_text.count("\n") + 1,
+        "sample_data": "\n".join(sample_lines),  # First 50 lines
+        "headers": sample_lines[0],
         "full_data_tokens": estimated_tokens,
         "max_tokens_exceeded": True,
         "content_type": "text/csv" if datatype == "csv" else "application/json",
@@ -156,56 +286,45 @@ def _make_api_request(
     if force_inline and force_file:
         raise ValueError("Cannot set both force_inline and force_file to True")
 
-    # Create a copy of params to avoid modifying the original
-    api_params = params.copy()
-    api_params.update(
-        {"function": function_name, "apikey": get_api_key(), "source": "alphavantagemcp"}
-    )
+    # Build request params from the caller's params plus the context defaults
+    # (apikey, source, entitlement); the caller's dict is not modified
+    api_params = {**params, "function": function_name, **get_default_params()}
 
-    # Handle entitlement parameter if present in params or global variable
-    current_entitlement = globals().get("_current_entitlement")
-    entitlement = api_params.get("entitlement") or current_entitlement
-
-    if entitlement:
-        api_params["entitlement"] = entitlement
-    elif "entitlement" in api_params:
+    # An entitlement passed in params takes precedence over the context one
+    if params.get("entitlement"):
+        api_params["entitlement"] = params["entitlement"]
+    elif not api_params.get("entitlement"):
         # Remove entitlement if it's None or empty
         api_params.pop("entitlement", None)
 
     # Make HTTP request to Alpha Vantage API
-    with httpx.Client() as client:
-        response = client.get(API_BASE_URL, params=api_params)
-        response.raise_for_status()
-        response_text = response.text
+    response = _http_client.get(API_BASE_URL, params=api_params)
+    response.raise_for_status()
+    response_text = response.text
 
     # Determine datatype from params (default to csv if not specified)
     datatype = api_params.get("datatype", "csv")
 
-    # Parse response into structured data for Sprint 1 infrastructure
-    try:
-        if datatype == "csv":
-            parsed_data = _parse_csv_to_dicts(response_text)
-        else:  # json
-            # Try parsing as JSON, fall back to raw text if it fails
-            try:
-                parsed_data = _parse_json_response(response_text)
-            except ValueError:
-                parsed_data = response_text
-    except ValueError:
-        # If parsing fails, fall back to legacy behavior
-        return response_text
-
-    # Try to load OutputConfig for Sprint 1 integration
-    try:
-        config = OutputConfig()
-        use_sprint1 = True
-    except Exception:
-        # MCP_OUTPUT_DIR not configured - fall back to R2 upload
-        use_sprint1 = False
+    # Load OutputConfig for Sprint 1 integration (None when MCP_OUTPUT_DIR is not
+    # configured - fall back to R2 upload)
+    config, handler = _load_output_config(os.environ.get("MCP_OUTPUT_DIR"))
+    use_sprint1 = config is not None
 
     # Sprint 1 Integration: Use output helper system
     if use_sprint1:
+        # Parse response into structured data for Sprint 1 infrastructure (the legacy
+        # path below works on the raw text, so it never pays for this pass)
         try:
+            parsed_data = _PARSERS.get(datatype, _parse_json_or_text)(response_text)
+        except ValueError:
+            # If parsing fails, fall back to legacy behavior
+            return response_text
+
+        try:
+            # Known-small responses skip the output decision entirely
+            if function_name in _ALWAYS_INLINE and not force_file:
+                return create_inline_response(parsed_data, format=datatype)
+
             # Make output decision using Sprint 1 infrastructure
             decision = should_use_output_helper(
                 data=parsed_data,
@@ -213,21 +332,28 @@ def _make_api_request(
                 force_inline=force_inline,
                 force_file=force_file,
                 filename_prefix=function_name.lower(),
+                raw_text=response_text,
             )
 
             # FILE OUTPUT: Use OutputHandler to write to file
             if decision.use_file:
-                # Generate filename with timestamp
-                timestamp = datetime.now(UTC).strftime("%Y%m%d_%H%M%S")
-                filename = f"{function_name.lower()}_{timestamp}.{datatype}"
+                # Generate unique filename from timestamp, pid and sequence number
+                filename = (
+                    f"{function_name.lower()}_{int(time.time())}_{os.getpid()}_"
+                    f"{next(_file_counter)}.{datatype}"
+                )
                 filepath = config.client_root / filename
 
-                # Write data to file using async OutputHandler
-                handler = OutputHandler(config)
+                # Write data to file using async OutputHandler. CSV is already CSV on
+                # the wire, so write the response text as-is instead of re-serializing
+                # the parsed rows
                 if datatype == "csv":
-                    metadata = asyncio.run(handler.write_csv(parsed_data, filepath, config))
-                else:  # json
-                    metadata = asyncio.run(handler.write_json(parsed_data, filepath, config))
+                    write = handler.write_csv_text(
+                        response_text, len(parsed_data), filepath, config
+                    )
+                else:
+                    write = handler.write_json(parsed_data, filepath, config)
+                metadata = _run_coroutine(write)
 
                 # Return standardized file reference response
                 return create_file_reference_response(filepath, metadata, config)
@@ -250,8 +376,8 @@ def _make_api_request(
         if estimated_tokens <= MAX_RESPONSE_TOKENS:
             if datatype == "json":
                 try:
-                    return json.loads(response_text)
-                except json.JSONDecodeError:
+                    return orjson.loads(response_text)
+                except orjson.JSONDecodeError:
                     return response_text
             else:
                 return response_text
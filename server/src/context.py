@@ -1,14 +1,37 @@
-from contextvars import ContextVar
+from contextvars import ContextVar, Token
 
 # Context variable to store the API key
 api_key_context: ContextVar[str | None] = ContextVar("api_key", default=None)
 
+# Query parameters added to every Alpha Vantage request in the current context
+# (apikey, source and, inside an entitlement-scoped tool call, entitlement).
+# Dicts stored here are rebuilt on change and never mutated in place.
+_NO_KEY_PARAMS = {"apikey": None, "source": "alphavantagemcp"}
+default_params_context: ContextVar[dict] = ContextVar("default_params", default=_NO_KEY_PARAMS)
+
 
 def set_api_key(api_key: str) -> None:
     """Set the API key in the current context."""
     api_key_context.set(api_key)
+    default_params_context.set({"apikey": api_key, "source": "alphavantagemcp"})
 
 
 def get_api_key() -> str | None:
     """Get the API key from the current context."""
     return api_key_context.get()
+
+
+def get_default_params() -> dict:
+    """Get the default request parameters for the current context (do not mutate)."""
+    return default_params_context.get()
+
+
+def set_entitlement(entitlement: str | None) -> Token:
+    """Set the entitlement sent with requests in the current context.
+
+    Returns a token for default_params_context.reset() to restore the previous value.
+    """
+    params = {k: v for k, v in default_params_context.get().items() if k != "entitlement"}
+    if entitlement:
+        params["entitlement"] = entitlement
+    return default_params_context.set(params)
@@ -5,6 +5,6 @@ This module provides token estimation and automatic decision logic for
 determining when to output data inline vs. write to files.
 """
 
-from .token_estimator import TokenEstimator
+from .token_estimator import TokenEstimator, get_default_estimator
 
-__all__ = ["TokenEstimator"]
+__all__ = ["TokenEstimator", "get_default_estimator"]
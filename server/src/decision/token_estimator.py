@@ -38,16 +38,24 @@ Examples:
     'Forced to file output by override'
 """
 
-import json
+import hashlib
+import os
+import re
+import threading
+from collections import OrderedDict
 from datetime import date, datetime
 from decimal import Decimal
+from functools import lru_cache
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
-import tiktoken
+import orjson
 
 from ..utils.output_config import OutputConfig
 
+if TYPE_CHECKING:
+    import tiktoken
+
 
 class TokenEstimationError(Exception):
     """Exception raised when token estimation fails."""
@@ -55,6 +63,80 @@ class TokenEstimationError(Exception):
     pass
 
 
+@lru_cache(maxsize=1)
+def _get_encoding() -> "tiktoken.Encoding":
+    """Load the cl100k_base encoding once per process.
+
+    Loading parses the multi-MB BPE merges table, so every TokenEstimator
+    shares the same (immutable) Encoding instance. tiktoken itself is imported
+    here so processes that never estimate tokens don't pay for it at startup.
+    """
+    import tiktoken
+
+    return tiktoken.get_encoding("cl100k_base")
+
+
+# Token counts keyed by a content fingerprint, so repeated payloads (cacheable
+# endpoints, retries) skip BPE encoding. Keys are digests, never the payloads.
+# LRU order; the lock guards it against concurrent worker-thread callers.
+_TOKEN_COUNT_CACHE: OrderedDict[bytes, int] = OrderedDict()
+_TOKEN_COUNT_CACHE_SIZE = 1024
+_TOKEN_COUNT_CACHE_LOCK = threading.Lock()
+
+
+# Texts longer than two chunks are split and encoded with encode_ordinary_batch,
+# which releases the GIL and spreads the work across threads. Splits fall just
+# after a newline followed by a non-whitespace character. No cl100k_base
+# pre-token spans that point (whitespace runs such as "\n \n" end before it),
+# so per-chunk counts add up exactly.
+_BATCH_CHUNK_CHARS = 64 * 1024
+_CHUNK_BOUNDARY = re.compile(r"\n(?=\S)")
+
+
+def _split_for_batch(text: str) -> list[str]:
+    """Split text into ~_BATCH_CHUNK_CHARS pieces at token-safe line boundaries."""
+    chunks = []
+    start = 0
+    while len(text) - start > _BATCH_CHUNK_CHARS:
+        boundary = _CHUNK_BOUNDARY.search(text, start + _BATCH_CHUNK_CHARS)
+        if boundary is None:
+            break
+        chunks.append(text[start : boundary.end()])
+        start = boundary.end()
+    chunks.append(text[start:])
+    return chunks
+
+
+# JSON conversions for types orjson does not serialize itself. orjson handles
+# datetime/date natively; they stay here for subclasses it rejects.
+_TYPE_CONVERTERS = {
+    datetime: datetime.isoformat,
+    date: date.isoformat,
+    Decimal: float,
+    Path: str,
+}
+
+
+def _convert_special_types(obj: Any) -> Any:
+    """Convert special types for JSON serialization (orjson default hook)."""
+    converter = _TYPE_CONVERTERS.get(type(obj))
+    if converter is None:
+        # Subclasses such as PosixPath: resolve once through the MRO and remember
+        for base in type(obj).__mro__[1:]:
+            converter = _TYPE_CONVERTERS.get(base)
+            if converter is not None:
+                _TYPE_CONVERTERS[type(obj)] = converter
+                break
+        else:
+            raise TypeError(f"Object of type {type(obj)} is not JSON serializable")
+    return converter(obj)
+
+
+def _fingerprint(text: str) -> bytes:
+    """Return a 16-byte BLAKE2b digest identifying text."""
+    return hashlib.blake2b(text.encode("utf-8", "surrogatepass"), digest_size=16).digest()
+
+
 class TokenEstimator:
     """
     Intelligent token estimation for output decision logic.
@@ -87,19 +169,22 @@ class TokenEstimator:
     # Sample size for row-based estimation
     SAMPLE_SIZE = 10
 
+    # Typical characters per token, for approximate counts of small raw text
+    CHARS_PER_TOKEN = 4
+
     def __init__(self):
         """
         Initialize TokenEstimator with tiktoken encoding.
 
-        Loads and caches the cl100k_base encoding (used by GPT-4 and GPT-3.5 Turbo).
-        This encoding is loaded once and reused for all estimations.
+        Uses the cl100k_base encoding (used by GPT-4 and GPT-3.5 Turbo). The
+        encoding is loaded once per process and shared by all estimators.
 
         Raises:
             TokenEstimationError: If tiktoken encoding cannot be loaded.
         """
         try:
-            # Load and cache encoding for GPT-4/GPT-3.5 Turbo
-            self.encoding = tiktoken.get_encoding("cl100k_base")
+            # Shared encoding for GPT-4/GPT-3.5 Turbo
+            self.encoding = _get_encoding()
         except Exception as e:
             raise TokenEstimationError(
                 f"Failed to load tiktoken encoding: {e}. "
@@ -187,11 +272,16 @@ class TokenEstimator:
         if len(data) > self.FALLBACK_THRESHOLD:
             return self.estimate_by_rows(data)
 
-        # Use tiktoken for accurate counting
+        # Convert to CSV-like string representation; unserializable data is an error,
+        # not a reason to fall back (the row sampler never serializes)
         try:
-            # Convert to CSV-like string representation
             csv_str = self._serialize_for_tokens(data)
-            return len(self.encoding.encode(csv_str))
+        except TypeError as e:
+            raise TokenEstimationError(f"Token estimation failed: {e}") from e
+
+        # Use tiktoken for accurate counting
+        try:
+            return self._count_tokens(csv_str)
         except Exception as e:
             # Fallback if tiktoken fails
             try:
@@ -233,12 +323,38 @@ class TokenEstimator:
         try:
             # Serialize to JSON with special type handling
             json_str = self._serialize_for_tokens(data)
-            return len(self.encoding.encode(json_str))
+            return self._count_tokens(json_str)
         except Exception as e:
             raise TokenEstimationError(
                 f"Failed to estimate JSON tokens: {e}. Ensure data is JSON-serializable."
             ) from e
 
+    def estimate_tokens_from_str(self, text: str) -> int:
+        """
+        Count tokens in an already-serialized string.
+
+        Used for raw API responses (CSV or JSON text), which skips the
+        parse-then-reserialize round trip of estimate_tokens.
+
+        Args:
+            text: Raw text to count tokens for.
+
+        Returns:
+            Token count.
+
+        Raises:
+            TokenEstimationError: If tiktoken fails to encode the text.
+
+        Examples:
+            >>> estimator = TokenEstimator()
+            >>> estimator.estimate_tokens_from_str("timestamp,open\\n2024-01-01,100.0")
+            14
+        """
+        try:
+            return self._count_tokens(text)
+        except Exception as e:
+            raise TokenEstimationError(f"Failed to count tokens in text: {e}") from e
+
     def estimate_by_rows(self, data: list[dict]) -> int:
         """
         Fast fallback estimation based on row sampling.
@@ -270,7 +386,7 @@ class TokenEstimator:
 
         Performance:
             - Samples only first 10 rows (constant time)
-            - No JSON serialization of full dataset
+            - No JSON serialization, only str() lengths of sampled values
             - ~100x faster than full counting for 100K+ rows
         """
         if not data:
@@ -281,9 +397,13 @@ class TokenEstimator:
         sample = data[:sample_size]
 
         try:
-            # Calculate average characters per row from sample
-            sample_str = self._serialize_for_tokens(sample)
-            avg_chars_per_row = len(sample_str) / sample_size
+            # Calculate average characters per row from sample without serializing:
+            # key + value text plus ~4 chars of compact JSON punctuation per field
+            # (quotes, colon, comma), and 2 for the braces of each row
+            sample_chars = sum(
+                len(str(key)) + len(str(value)) + 4 for row in sample for key, value in row.items()
+            )
+            avg_chars_per_row = sample_chars / sample_size + 2
 
             # Estimate total tokens conservatively
             # Use 0.75 multiplier (conservative: ~1.33 chars per token)
@@ -299,6 +419,7 @@ class TokenEstimator:
         config: OutputConfig,
         force_inline: bool = False,
         force_file: bool = False,
+        raw_text: str | None = None,
     ) -> tuple[bool, int, str]:
         """
         Determine if data should be written to file or returned inline.
@@ -311,6 +432,10 @@ class TokenEstimator:
             config: Output configuration with token threshold.
             force_inline: Force inline output regardless of size (override).
             force_file: Force file output regardless of size (override).
+            raw_text: Optional serialized form of data (e.g. the raw API response).
+                When given, tokens are counted on it directly instead of
+                re-serializing data, except for datasets large enough to use
+                row-based fallback estimation.
 
         Returns:
             Tuple of (should_write_file, token_count, reason_string).
@@ -365,9 +490,26 @@ class TokenEstimator:
                 "Choose one override or neither for automatic decision."
             )
 
+        # Every token covers at least one UTF-8 byte, so raw text no larger than
+        # the threshold in bytes cannot exceed it - decide without tokenizing
+        threshold = config.output_token_threshold
+        if raw_text is not None and not (force_inline or force_file):
+            size = len(raw_text) if raw_text.isascii() else len(raw_text.encode())
+            if size <= threshold:
+                token_count = max(1, size // self.CHARS_PER_TOKEN)
+                reason = (
+                    f"Below threshold (~{token_count:,} tokens < {threshold:,} token threshold)"
+                )
+                return (False, token_count, reason)
+
         # Estimate tokens
         try:
-            token_count = self.estimate_tokens(data)
+            if raw_text is not None and not (
+                isinstance(data, list) and len(data) > self.FALLBACK_THRESHOLD
+            ):
+                token_count = self.estimate_tokens_from_str(raw_text)
+            else:
+                token_count = self.estimate_tokens(data)
         except Exception as e:
             raise TokenEstimationError(f"Failed to estimate tokens for output decision: {e}") from e
 
@@ -379,8 +521,6 @@ class TokenEstimator:
             return (True, token_count, "Forced to file output by override")
 
         # Automatic decision based on threshold
-        threshold = config.output_token_threshold
-
         if token_count > threshold:
             reason = (
                 f"Exceeds token threshold ({token_count:,} tokens > {threshold:,} token threshold)"
@@ -390,6 +530,40 @@ class TokenEstimator:
             reason = f"Below threshold ({token_count:,} tokens < {threshold:,} token threshold)"
             return (False, token_count, reason)
 
+    def _count_tokens(self, text: str) -> int:
+        """
+        Count tiktoken tokens in text, reusing counts for previously seen content.
+
+        Args:
+            text: String to count tokens for.
+
+        Returns:
+            Number of tokens in text.
+        """
+        key = _fingerprint(text)
+        with _TOKEN_COUNT_CACHE_LOCK:
+            count = _TOKEN_COUNT_CACHE.get(key)
+            if count is not None:
+                _TOKEN_COUNT_CACHE.move_to_end(key)
+        if count is None:
+            # API responses never contain special tokens, so skip the special-token
+            # scan of encode() and use the ordinary encoder
+            if len(text) > 2 * _BATCH_CHUNK_CHARS:
+                chunks = _split_for_batch(text)
+                encoded = self.encoding.encode_ordinary_batch(
+                    chunks, num_threads=min(len(chunks), os.cpu_count() or 1)
+                )
+                count = sum(map(len, encoded))
+            else:
+                count = len(self.encoding.encode_ordinary(text))
+            # Encoding runs outside the lock; only the bookkeeping is serialized
+            with _TOKEN_COUNT_CACHE_LOCK:
+                _TOKEN_COUNT_CACHE[key] = count
+                if len(_TOKEN_COUNT_CACHE) > _TOKEN_COUNT_CACHE_SIZE:
+                    # Evict the least recently used entry
+                    _TOKEN_COUNT_CACHE.popitem(last=False)
+        return count
+
     def _serialize_for_tokens(self, data: Any) -> str:
         """
         Serialize data to string for token counting.
@@ -408,22 +582,30 @@ class TokenEstimator:
         Raises:
             TypeError: If data contains non-serializable types.
         """
-
-        def _convert_special_types(obj):
-            """Convert special types for JSON serialization."""
-            if isinstance(obj, datetime | date):
-                return obj.isoformat()
-            elif isinstance(obj, Decimal):
-                return float(obj)
-            elif isinstance(obj, Path):
-                return str(obj)
-            raise TypeError(f"Object of type {type(obj)} is not JSON serializable")
-
         try:
-            return json.dumps(data, default=_convert_special_types, ensure_ascii=False)
+            return orjson.dumps(
+                data, default=_convert_special_types, option=orjson.OPT_NON_STR_KEYS
+            ).decode()
         except TypeError as e:
             raise TypeError(
                 f"Cannot serialize data for token counting: {e}. "
                 "Ensure all data is JSON-serializable or convertible "
                 "(datetime, Decimal, Path are supported)."
             ) from e
+
+
+@lru_cache(maxsize=1)
+def get_default_estimator() -> TokenEstimator:
+    """
+    Return the process-wide TokenEstimator.
+
+    Created on first use rather than at import so that importing this module
+    never triggers the tiktoken encoding load (or its download).
+
+    Returns:
+        Shared TokenEstimator instance.
+
+    Raises:
+        TokenEstimationError: If tiktoken encoding cannot be loaded.
+    """
+    return TokenEstimator()
@@ -15,6 +15,7 @@ Main exports:
     create_inline_response: Create standardized inline data response
     get_logger: Get configured logger instance
     log_decision: Log output decisions
+    flush_decisions: Log buffered output decisions
     log_file_operation: Log file operations
     log_security_event: Log security events
     log_performance_metric: Log performance metrics
@@ -51,6 +52,7 @@ from .helpers import (
     should_use_output_helper,
 )
 from .logging_config import (
+    flush_decisions,
     get_logger,
     log_decision,
     log_file_operation,
@@ -67,6 +69,7 @@ __all__ = [
     # Logging
     "get_logger",
     "log_decision",
+    "flush_decisions",
     "log_file_operation",
     "log_security_event",
     "log_performance_metric",
@@ -37,31 +37,191 @@ Examples:
 
 import csv
 import io
+import os
+import threading
+import time
 from dataclasses import dataclass
-from datetime import UTC, datetime
+from functools import lru_cache
+from itertools import chain
+from operator import itemgetter
 from pathlib import Path
 from typing import Any
 
-from ..decision.token_estimator import TokenEstimator
+from ..decision.token_estimator import get_default_estimator
 from ..output.handler import FileMetadata
 from ..utils.output_config import OutputConfig
-from .logging_config import get_logger, log_decision
+from .logging_config import get_logger, is_level_enabled, log_decision
 
 # Initialize logger
 logger = get_logger()
 
+# (epoch second, filename timestamp, ISO timestamp) for the last second seen;
+# replaced as a whole tuple, so concurrent readers always see a consistent entry
+_timestamp_cache: tuple[int, str, str] = (-1, "", "")
 
-@dataclass
+
+def _now_strings() -> tuple[str, str]:
+    """
+    Return the current UTC time as filename and ISO 8601 strings.
+
+    Both strings have one-second resolution and are formatted once per second,
+    however many decisions and responses are produced within it.
+
+    Returns:
+        Tuple of ("YYYY-MM-DD_HHMMSS", "YYYY-MM-DDTHH:MM:SS+00:00").
+    """
+    global _timestamp_cache
+    now = int(time.time())
+    cached = _timestamp_cache
+    if cached[0] != now:
+        utc = time.gmtime(now)
+        cached = (
+            now,
+            time.strftime("%Y-%m-%d_%H%M%S", utc),
+            time.strftime("%Y-%m-%dT%H:%M:%S+00:00", utc),
+        )
+        _timestamp_cache = cached
+    return cached[1], cached[2]
+
+
+# Container types counted by length (a constant tuple; `list | dict` builds a
+# new UnionType on every evaluation)
+_LIST_OR_DICT = (list, dict)
+
+# Formats accepted by create_inline_response
+_VALID_INLINE_FORMATS = frozenset({"json", "csv"})
+
+# Suggested filename suffixes by (format, compressed), covering every output_format
+# OutputConfig accepts. Looked up per call rather than cached on the config, whose
+# fields may change after construction
+_FILENAME_SUFFIXES = {
+    (fmt, compressed): f".{fmt}.gz" if compressed else f".{fmt}"
+    for fmt in ("csv", "json")
+    for compressed in (False, True)
+}
+
+# Per-thread StringIO reused by the csv.DictWriter fallback
+_tls = threading.local()
+
+# Buffers that grew beyond this many characters are dropped instead of reused
+_CSV_BUFFER_MAX_CHARS = 1_000_000
+
+
+def _get_csv_buffer() -> io.StringIO:
+    """
+    Return this thread's empty CSV buffer, creating it on first use.
+
+    Returns:
+        Empty StringIO positioned at the start.
+    """
+    buf = getattr(_tls, "csv_buffer", None)
+    if buf is None:
+        buf = _tls.csv_buffer = io.StringIO()
+    return buf
+
+
+def _release_csv_buffer(buf: io.StringIO, size: int) -> None:
+    """
+    Empty a buffer from _get_csv_buffer for the next call on this thread.
+
+    Args:
+        buf: Buffer returned by _get_csv_buffer.
+        size: Number of characters that were written to it.
+    """
+    if size > _CSV_BUFFER_MAX_CHARS:
+        # Don't keep a large allocation alive for the life of the thread
+        _tls.csv_buffer = None
+    else:
+        buf.seek(0)
+        buf.truncate()
+
+
+# Characters that make csv.writer quote a field (QUOTE_MINIMAL, default dialect).
+# Checked with one `in` per character: each is a memchr-speed scan, far faster
+# than a regex character class or a set membership test over the text
+_CSV_QUOTE_CHARS = (",", '"', "\r", "\n")
+
+# Value types whose str() matches what csv.writer emits
+_CSV_PLAIN_TYPES = frozenset({str, int, float})
+
+
+def _rows_to_csv_fast(data: list[dict], headers: list) -> str | None:
+    """
+    Render rows as CSV with plain string joins when no field needs quoting.
+
+    Produces exactly what csv.DictWriter (default dialect) would for the same
+    rows. Returns None whenever that cannot be guaranteed cheaply - rows with
+    different keys, values other than str/int/float, or fields containing a
+    delimiter, quote or line break - so the caller can use csv.DictWriter.
+
+    Args:
+        data: Non-empty list of row dictionaries.
+        headers: Column names (keys of the first row).
+
+    Returns:
+        CSV string with header line and CRLF line endings, or None.
+    """
+    # Single-column rows have csv quirks (empty field is written as ""), so
+    # leave them to the csv module
+    width = len(headers)
+    if width < 2 or not all(type(h) is str for h in headers):
+        return None
+
+    get = itemgetter(*headers)
+    try:
+        rows = [get(row) for row in data if len(row) == width]
+    except KeyError:
+        return None
+    if len(rows) != len(data):
+        return None
+
+    value_types = set(map(type, chain.from_iterable(rows)))
+    if not value_types <= _CSV_PLAIN_TYPES:
+        return None
+    if value_types != {str}:
+        rows = [tuple(map(str, row)) for row in rows]
+
+    # One scan over all field text (and headers) for characters needing quotes
+    text = "".join(chain(headers, chain.from_iterable(rows)))
+    if any(c in text for c in _CSV_QUOTE_CHARS):
+        return None
+
+    return "\r\n".join(chain((",".join(headers),), map(",".join, rows))) + "\r\n"
+
+
+@lru_cache(maxsize=1024)
+def _relativize(parent: str, root: str) -> str | None:
+    """
+    Return directory parent relative to root, or None if it is not under root.
+
+    Cached because batches of file outputs share the same few directories.
+
+    Args:
+        parent: Directory containing the output file.
+        root: Client root directory.
+
+    Returns:
+        Relative directory ("." for root itself), or None.
+    """
+    try:
+        return str(Path(parent).relative_to(root))
+    except ValueError:
+        return None
+
+
+@dataclass(slots=True, frozen=True)
 class OutputDecision:
     """
     Decision about whether to use file output or inline response.
 
     This dataclass encapsulates all information needed to make an informed
-    decision about how to return data to the MCP client.
+    decision about how to return data to the MCP client. Instances are
+    immutable and slotted (one is created per tool call).
 
     Attributes:
         use_file: Whether to write data to file (True) or return inline (False).
-        token_count: Estimated token count of the data.
+        token_count: Estimated token count of the data (0 when forced by an override,
+            as the data is not tokenized then).
         row_count: Number of rows/elements in the data.
         reason: Human-readable explanation of the decision.
         suggested_filename: Suggested filename if writing to file (based on timestamp and format).
@@ -87,12 +247,50 @@ class OutputDecision:
     suggested_filename: str
 
 
+def _decide_fast(
+    data: Any,
+    config: OutputConfig,
+    force_inline: bool,
+    force_file: bool,
+    raw_text: str | None,
+) -> tuple[bool, int, int, str]:
+    """
+    Compute the file-vs-inline decision without validation, naming or logging.
+
+    Args:
+        data: Data to evaluate (already validated by the caller).
+        config: Output configuration with thresholds.
+        force_inline: Force inline output regardless of size.
+        force_file: Force file output regardless of size.
+        raw_text: Optional raw text data was parsed from.
+
+    Returns:
+        Tuple of (use_file, token_count, row_count, reason).
+    """
+    # Overrides decide on their own, so don't tokenize the data for them
+    if force_inline:
+        should_file, token_count, reason = False, 0, "Forced to inline output by override"
+    elif force_file:
+        should_file, token_count, reason = True, 0, "Forced to file output by override"
+    else:
+        # Shared token estimator (encoding loaded once per process)
+        should_file, token_count, reason = get_default_estimator().should_output_to_file(
+            data, config, raw_text=raw_text
+        )
+
+    # Row/element count
+    row_count = len(data) if isinstance(data, _LIST_OR_DICT) else 1
+
+    return should_file, token_count, row_count, reason
+
+
 def should_use_output_helper(
     data: Any,
     config: OutputConfig,
     force_inline: bool = False,
     force_file: bool = False,
     filename_prefix: str = "output",
+    raw_text: str | None = None,
     **kwargs: Any,
 ) -> OutputDecision:
     """
@@ -112,6 +310,8 @@ def should_use_output_helper(
         force_inline: Force inline output regardless of size (default: False).
         force_file: Force file output regardless of size (default: False).
         filename_prefix: Prefix for suggested filename (default: "output").
+        raw_text: Raw text data was parsed from (default: None). When given,
+            tokens are counted on it instead of re-serializing data.
         **kwargs: Additional context for logging.
 
     Returns:
@@ -156,7 +356,7 @@ def should_use_output_helper(
         raise ValueError("data cannot be None")
 
     # Check for empty data
-    if isinstance(data, list | dict) and len(data) == 0:
+    if isinstance(data, _LIST_OR_DICT) and len(data) == 0:
         raise ValueError("Cannot process empty data")
 
     # Validate override flags
@@ -166,36 +366,20 @@ def should_use_output_helper(
             "Choose one override or neither for automatic decision."
         )
 
-    # Initialize token estimator
-    estimator = TokenEstimator()
-
-    # Get token estimation and decision from TokenEstimator
-    should_file, token_count, reason = estimator.should_output_to_file(
-        data, config, force_inline=force_inline, force_file=force_file
+    should_file, token_count, row_count, reason = _decide_fast(
+        data, config, force_inline, force_file, raw_text
     )
 
-    # Calculate row/element count
-    row_count = 0
-    if isinstance(data, list):
-        row_count = len(data)
-    elif isinstance(data, dict):
-        row_count = len(data)
-    else:
-        row_count = 1
-
     # Determine format for filename suggestion
     if isinstance(data, list) and data and isinstance(data[0], dict):
         format_ext = config.output_format  # csv or json
     else:
         format_ext = "json"
 
-    # Generate suggested filename with timestamp
-    timestamp = datetime.now(UTC).strftime("%Y-%m-%d_%H%M%S")
-    suggested_filename = f"{filename_prefix}_{timestamp}.{format_ext}"
-
-    # Add compression extension if enabled
-    if config.output_compression:
-        suggested_filename += ".gz"
+    # Generate suggested filename with timestamp (and .gz if compression is enabled)
+    timestamp = _now_strings()[0]
+    suffix = _FILENAME_SUFFIXES[format_ext, bool(config.output_compression)]
+    suggested_filename = f"{filename_prefix}_{timestamp}{suffix}"
 
     # Create decision object
     decision = OutputDecision(
@@ -206,25 +390,25 @@ def should_use_output_helper(
         suggested_filename=suggested_filename,
     )
 
-    # Determine decision type for logging
-    if force_inline:
-        decision_type = "forced_inline"
-    elif force_file:
-        decision_type = "forced_file"
-    else:
-        decision_type = "automatic"
-
-    # Log the decision with structured context
-    log_decision(
-        decision_type=decision_type,
-        use_file=should_file,
-        token_count=token_count,
-        row_count=row_count,
-        reason=reason,
-        threshold=config.output_token_threshold,
-        suggested_filename=suggested_filename,
-        **kwargs,
-    )
+    # Log the decision with structured context (skipped when INFO is filtered out)
+    if is_level_enabled("INFO"):
+        if force_inline:
+            decision_type = "forced_inline"
+        elif force_file:
+            decision_type = "forced_file"
+        else:
+            decision_type = "automatic"
+
+        log_decision(
+            decision_type=decision_type,
+            use_file=should_file,
+            token_count=token_count,
+            row_count=row_count,
+            reason=reason,
+            threshold=config.output_token_threshold,
+            suggested_filename=suggested_filename,
+            **kwargs,
+        )
 
     return decision
 
@@ -287,16 +471,19 @@ def create_file_reference_response(
         1000
     """
     # Get relative path from client_root for portability
-    try:
-        relative_path = filepath.relative_to(config.client_root)
-    except ValueError:
+    relative_parent = _relativize(str(filepath.parent), str(config.client_root))
+    if relative_parent is None:
         # If path is not relative to client_root, use the path as-is
-        relative_path = Path(metadata.filepath)
+        relative_path = str(Path(metadata.filepath))
+    elif relative_parent == ".":
+        relative_path = filepath.name
+    else:
+        relative_path = os.path.join(relative_parent, filepath.name)
 
     # Build response
     response = {
         "type": "file_reference",
-        "filepath": str(relative_path),
+        "filepath": relative_path,
         "filename": filepath.name,
         "size": metadata.size_bytes,
         "size_formatted": metadata.size_human,
@@ -309,20 +496,13 @@ def create_file_reference_response(
 
     # Include full metadata if enabled
     if config.output_metadata:
-        response["metadata"] = {
-            "filepath": metadata.filepath,
-            "timestamp": metadata.timestamp,
-            "size_bytes": metadata.size_bytes,
-            "size_human": metadata.size_human,
-            "format": metadata.format,
-            "compressed": metadata.compressed,
-            "rows": metadata.rows,
-            "checksum": metadata.checksum,
-        }
+        # Shallow copy of the dataclass fields (all flat values, so no need for
+        # the recursive copying of dataclasses.asdict)
+        response["metadata"] = vars(metadata).copy()
 
     logger.debug(
         "Created file reference response",
-        filepath=str(relative_path),
+        filepath=relative_path,
         size=metadata.size_bytes,
         rows=metadata.rows,
         format=metadata.format,
@@ -388,18 +568,11 @@ def create_inline_response(
         'value'
     """
     # Validate format
-    valid_formats = ["json", "csv"]
-    if format not in valid_formats:
-        raise ValueError(f"Invalid format: {format}. Must be one of: {', '.join(valid_formats)}")
+    if format not in _VALID_INLINE_FORMATS:
+        raise ValueError(f"Invalid format: {format}. Must be one of: json, csv")
 
     # Calculate row count
-    row_count = 0
-    if isinstance(data, list):
-        row_count = len(data)
-    elif isinstance(data, dict):
-        row_count = len(data)
-    else:
-        row_count = 1
+    row_count = len(data) if isinstance(data, _LIST_OR_DICT) else 1
 
     # Convert to CSV if requested
     if format == "csv":
@@ -409,13 +582,18 @@ def create_inline_response(
                 f"Got: {type(data)}"
             )
 
-        # Convert list of dicts to CSV string
-        output = io.StringIO()
+        # Convert list of dicts to CSV string (plain joins when nothing needs quoting)
         headers = list(data[0].keys())
-        writer = csv.DictWriter(output, fieldnames=headers)
-        writer.writeheader()
-        writer.writerows(data)
-        csv_string = output.getvalue()
+        csv_string = _rows_to_csv_fast(data, headers)
+        if csv_string is None:
+            output = _get_csv_buffer()
+            try:
+                writer = csv.DictWriter(output, fieldnames=headers)
+                writer.writeheader()
+                writer.writerows(data)
+                csv_string = output.getvalue()
+            finally:
+                _release_csv_buffer(output, output.tell())
 
         response_data = csv_string
     else:
@@ -428,7 +606,7 @@ def create_inline_response(
         "format": format,
         "data": response_data,
         "row_count": row_count,
-        "timestamp": datetime.now(UTC).isoformat(),
+        "timestamp": _now_strings()[1],
     }
 
     logger.debug(
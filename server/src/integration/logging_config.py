@@ -3,8 +3,10 @@ Logging configuration for Alpha Vantage MCP Server.
 
 This module sets up structured logging with loguru, providing:
 - Configurable log levels via MCP_LOG_LEVEL environment variable
+- Optional queued file logging via MCP_LOG_ENQUEUE (for multi-process servers)
+- Optional batching of output decision logs via MCP_LOG_DECISION_BATCH
 - Contextual logging with decision metadata
-- File and console output
+- File and console output (file records as JSON lines)
 - Performance metrics tracking
 - Security event logging integration
 
@@ -15,14 +17,48 @@ Examples:
     >>> logger.debug("Token estimation", tokens=1500, time_ms=23.5)
 """
 
+import atexit
 import os
 import sys
+import threading
 from pathlib import Path
 from typing import Any
 
+import orjson
 from loguru import logger
 
 
+def _format_file_record(record: dict[str, Any]) -> str:
+    """
+    Render a log record as a single JSON object for the file handler.
+
+    Extra context is serialized with orjson instead of the dict repr, so each
+    line of the log file can be parsed with any JSON reader.
+
+    Args:
+        record: loguru record dictionary.
+
+    Returns:
+        loguru format string producing the JSON line (and any traceback).
+    """
+    line = orjson.dumps(
+        {
+            "time": record["time"].isoformat(),
+            "level": record["level"].name,
+            "name": record["name"],
+            "function": record["function"],
+            "line": record["line"],
+            "message": record["message"],
+            "extra": record["extra"],
+        },
+        default=str,
+        option=orjson.OPT_NON_STR_KEYS,
+    ).decode()
+    # loguru treats the returned string as a template: escape format fields and markup
+    line = line.replace("{", "{{").replace("}", "}}").replace("<", "\\<")
+    return line + "\n{exception}"
+
+
 class LoggingConfig:
     """
     Configuration and setup for MCP server logging.
@@ -37,10 +73,23 @@ class LoggingConfig:
         log_level: Log level from MCP_LOG_LEVEL env var (default: INFO).
         log_dir: Directory for log files (default: logs/).
         log_file: Path to log file (default: logs/mcp_server.log).
+        enqueue: Route file records through a multiprocessing-safe queue, from
+            MCP_LOG_ENQUEUE="1" (default: off). Only needed when several
+            processes share the log file; handlers are thread-safe either way.
+        decision_batch_size: Output decisions logged together as one record, from
+            MCP_LOG_DECISION_BATCH (default: 1, i.e. each decision is logged
+            immediately). Meant for long-lived stdio servers; the Lambda
+            handler flushes the buffer at the end of every invocation.
         console_format: Format string for console output.
-        file_format: Format string for file output.
+        file_format: Formatter rendering file records as JSON lines.
     """
 
+    # Set once loguru handlers are installed; later instances reuse them
+    _CONFIGURED = False
+
+    # Lowest severity number accepted by the installed handlers (see is_level_enabled)
+    _MIN_LEVEL_NO = 0
+
     # Valid log levels
     VALID_LEVELS = ["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"]
 
@@ -59,13 +108,8 @@ class LoggingConfig:
         "<level>{message}</level>"
     )
 
-    FILE_FORMAT = (
-        "{time:YYYY-MM-DD HH:mm:ss.SSS} | "
-        "{level: <8} | "
-        "{name}:{function}:{line} | "
-        "{message} | "
-        "{extra}"
-    )
+    # File records are written as JSON lines
+    FILE_FORMAT = staticmethod(_format_file_record)
 
     def __init__(self):
         """Initialize logging configuration."""
@@ -81,6 +125,20 @@ class LoggingConfig:
             )
             self.log_level = self.DEFAULT_LEVEL
 
+        # Queued (pickled) file writes are only needed across processes
+        self.enqueue = os.getenv("MCP_LOG_ENQUEUE", "0") == "1"
+
+        # Number of output decisions to buffer per log record
+        batch_size = os.getenv("MCP_LOG_DECISION_BATCH", "1")
+        try:
+            self.decision_batch_size = max(1, int(batch_size))
+        except ValueError:
+            print(
+                f"Warning: Invalid MCP_LOG_DECISION_BATCH '{batch_size}'. Using default: 1",
+                file=sys.stderr,
+            )
+            self.decision_batch_size = 1
+
         # Set up log directory
         self.log_dir = self.DEFAULT_LOG_DIR
         self.log_file = self.log_dir / self.DEFAULT_LOG_FILE
@@ -99,7 +157,14 @@ class LoggingConfig:
         - Console handler with colored output
         - File handler with rotation and retention
         - Structured logging with extra fields
+
+        Runs once per process: handlers are installed by the first instance, and
+        later instances leave them in place rather than removing and re-adding
+        them (which could drop queued records or duplicate sinks).
         """
+        if LoggingConfig._CONFIGURED:
+            return
+
         # Remove default handler
         logger.remove()
 
@@ -123,9 +188,13 @@ class LoggingConfig:
             compression="zip",  # Compress rotated logs
             backtrace=True,
             diagnose=True,
-            enqueue=True,  # Thread-safe logging
+            enqueue=self.enqueue,  # Multi-process safe logging (opt-in)
         )
 
+        # Both handlers share one level, so it is the minimum that reaches any sink
+        LoggingConfig._MIN_LEVEL_NO = logger.level(self.log_level).no
+        LoggingConfig._CONFIGURED = True
+
     def get_logger(self):
         """
         Get configured logger instance.
@@ -143,6 +212,11 @@ class LoggingConfig:
 
 # Global logging configuration instance
 _config = None
+_config_lock = threading.Lock()
+
+# Output decisions waiting to be logged together (see MCP_LOG_DECISION_BATCH)
+_pending_decisions: list[dict[str, Any]] = []
+_pending_decisions_lock = threading.Lock()
 
 
 def get_logger():
@@ -165,10 +239,33 @@ def get_logger():
     """
     global _config
     if _config is None:
-        _config = LoggingConfig()
+        with _config_lock:
+            if _config is None:
+                _config = LoggingConfig()
     return _config.get_logger()
 
 
+def is_level_enabled(level: str) -> bool:
+    """
+    Check whether messages at the given level reach the configured handlers.
+
+    Lets callers skip building structured log context that would be discarded.
+    Compares against the level the handlers were installed with (MCP_LOG_LEVEL).
+
+    Args:
+        level: Level name (e.g., "DEBUG", "INFO").
+
+    Returns:
+        True if a message at this level would be emitted.
+
+    Examples:
+        >>> is_level_enabled("CRITICAL")
+        True
+    """
+    logger = get_logger()
+    return logger.level(level).no >= LoggingConfig._MIN_LEVEL_NO
+
+
 def log_decision(
     decision_type: str,
     use_file: bool,
@@ -180,6 +277,9 @@ def log_decision(
     """
     Log an output decision with structured context.
 
+    With MCP_LOG_DECISION_BATCH above 1, decisions are buffered and logged
+    together by flush_decisions() once that many have accumulated.
+
     Args:
         decision_type: Type of decision ("automatic", "forced_inline", "forced_file").
         use_file: Whether output will be written to file.
@@ -199,8 +299,26 @@ def log_decision(
         ... )
     """
     logger = get_logger()
+    if _config.decision_batch_size > 1:
+        with _pending_decisions_lock:
+            _pending_decisions.append(
+                {
+                    "decision_type": decision_type,
+                    "use_file": use_file,
+                    "token_count": token_count,
+                    "row_count": row_count,
+                    "reason": reason,
+                    **kwargs,
+                }
+            )
+            full = len(_pending_decisions) >= _config.decision_batch_size
+        if full:
+            flush_decisions()
+        return
+
+    # Message is formatted by loguru from the kwargs, only if a handler accepts it
     logger.info(
-        f"Output decision: {decision_type}",
+        "Output decision: {decision_type}",
         decision_type=decision_type,
         use_file=use_file,
         token_count=token_count,
@@ -210,6 +328,29 @@ def log_decision(
     )
 
 
+def flush_decisions():
+    """
+    Log any buffered output decisions as a single record.
+
+    Only does anything when MCP_LOG_DECISION_BATCH is above 1. Called
+    automatically when the buffer fills, at the end of each Lambda invocation
+    and at interpreter exit.
+
+    Examples:
+        >>> flush_decisions()
+    """
+    global _pending_decisions
+    with _pending_decisions_lock:
+        decisions, _pending_decisions = _pending_decisions, []
+    if decisions:
+        get_logger().info(
+            "Batched output decisions: {count}", count=len(decisions), decisions=decisions
+        )
+
+
+atexit.register(flush_decisions)
+
+
 def log_file_operation(
     operation: str,
     filepath: str,
@@ -340,8 +481,9 @@ def log_performance_metric(
         ... )
     """
     logger = get_logger()
+    # Message is formatted by loguru from the kwargs, only if DEBUG is enabled
     logger.debug(
-        f"Performance: {metric_name} = {value}{unit}",
+        "Performance: {metric_name} = {value}{unit}",
         metric_name=metric_name,
         value=value,
         unit=unit,
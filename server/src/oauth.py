@@ -6,6 +6,8 @@ import json
 import secrets
 import urllib.parse
 
+from src.utils.serialization import json_dumps
+
 
 def generate_authorization_code() -> str:
     """Generate a secure authorization code."""
@@ -58,13 +60,13 @@ def handle_metadata_discovery(event: dict) -> dict:
         host = headers.get("Host") or headers.get("host")
 
         if not host:
-            return {"statusCode": 400, "body": json.dumps({"error": "missing_host_header"})}
+            return {"statusCode": 400, "body": json_dumps({"error": "missing_host_header"})}
 
         # Validate that we're using HTTPS (except for localhost in development)
         if not host.startswith("localhost") and not headers.get("X-Forwarded-Proto") == "https":
             return {
                 "statusCode": 400,
-                "body": json.dumps(
+                "body": json_dumps(
                     {
                         "error": "invalid_request",
                         "error_description": "OAuth endpoints require HTTPS",
@@ -96,7 +98,7 @@ def handle_metadata_discovery(event: dict) -> dict:
             "Access-Control-Allow-Origin": "*",
             "Cache-Control": "public, max-age=3600",
         },
-        "body": json.dumps(metadata),
+        "body": json_dumps(metadata),
     }
 
 
@@ -123,7 +125,7 @@ def handle_authorization_request(event: dict) -> dict:
     if not client_id or not redirect_uri:
         return {
             "statusCode": 400,
-            "body": json.dumps(
+            "body": json_dumps(
                 {"error": "invalid_request", "error_description": "Missing required parameters"}
             ),
         }
@@ -132,7 +134,7 @@ def handle_authorization_request(event: dict) -> dict:
     if not redirect_uri.startswith(("https://", "http://localhost")):
         return {
             "statusCode": 400,
-            "body": json.dumps(
+            "body": json_dumps(
                 {"error": "invalid_request", "error_description": "Invalid redirect URI"}
             ),
         }
@@ -206,7 +208,7 @@ def handle_authorization_form_submission(event: dict, query_params: dict) -> dic
         except (json.JSONDecodeError, ValueError):
             return {
                 "statusCode": 400,
-                "body": json.dumps(
+                "body": json_dumps(
                     {"error": "invalid_request", "error_description": "Malformed request body"}
                 ),
             }
@@ -321,7 +323,7 @@ def handle_token_request(event: dict) -> dict:
         except (json.JSONDecodeError, ValueError):
             return {
                 "statusCode": 400,
-                "body": json.dumps(
+                "body": json_dumps(
                     {"error": "invalid_request", "error_description": "Malformed request body"}
                 ),
             }
@@ -335,7 +337,7 @@ def handle_token_request(event: dict) -> dict:
     elif grant_type == "client_credentials":
         return handle_client_credentials_grant(params)
     else:
-        return {"statusCode": 400, "body": json.dumps({"error": "unsupported_grant_type"})}
+        return {"statusCode": 400, "body": json_dumps({"error": "unsupported_grant_type"})}
 
 
 def handle_authorization_code_grant(params: dict) -> dict:
@@ -349,7 +351,7 @@ def handle_authorization_code_grant(params: dict) -> dict:
     if not all([code, client_id, redirect_uri]):
         return {
             "statusCode": 400,
-            "body": json.dumps(
+            "body": json_dumps(
                 {"error": "invalid_request", "error_description": "Missing required parameters"}
             ),
         }
@@ -362,7 +364,7 @@ def handle_authorization_code_grant(params: dict) -> dict:
     except (json.JSONDecodeError, ValueError):
         return {
             "statusCode": 400,
-            "body": json.dumps(
+            "body": json_dumps(
                 {"error": "invalid_grant", "error_description": "Invalid authorization code"}
             ),
         }
@@ -371,7 +373,7 @@ def handle_authorization_code_grant(params: dict) -> dict:
     if code_data.get("client_id") != client_id or code_data.get("redirect_uri") != redirect_uri:
         return {
             "statusCode": 400,
-            "body": json.dumps(
+            "body": json_dumps(
                 {"error": "invalid_grant", "error_description": "Code validation failed"}
             ),
         }
@@ -383,14 +385,14 @@ def handle_authorization_code_grant(params: dict) -> dict:
         if not verify_pkce_challenge(code_verifier, code_challenge, code_challenge_method):
             return {
                 "statusCode": 400,
-                "body": json.dumps(
+                "body": json_dumps(
                     {"error": "invalid_grant", "error_description": "PKCE verification failed"}
                 ),
             }
     elif code_challenge:  # PKCE was used in auth request but no verifier provided
         return {
             "statusCode": 400,
-            "body": json.dumps(
+            "body": json_dumps(
                 {"error": "invalid_request", "error_description": "Missing code_verifier"}
             ),
         }
@@ -400,7 +402,7 @@ def handle_authorization_code_grant(params: dict) -> dict:
     if not api_key:
         return {
             "statusCode": 400,
-            "body": json.dumps(
+            "body": json_dumps(
                 {"error": "invalid_grant", "error_description": "No API key found in authorization"}
             ),
         }
@@ -422,7 +424,7 @@ def handle_authorization_code_grant(params: dict) -> dict:
             "Cache-Control": "no-store",
             "Pragma": "no-cache",
         },
-        "body": json.dumps(token_response),
+        "body": json_dumps(token_response),
     }
 
 
@@ -435,7 +437,7 @@ def handle_client_credentials_grant(params: dict) -> dict:
     if not client_id:
         return {
             "statusCode": 400,
-            "body": json.dumps(
+            "body": json_dumps(
                 {"error": "invalid_request", "error_description": "Missing client_id"}
             ),
         }
@@ -444,7 +446,7 @@ def handle_client_credentials_grant(params: dict) -> dict:
     if not client_secret:
         return {
             "statusCode": 400,
-            "body": json.dumps(
+            "body": json_dumps(
                 {"error": "invalid_client", "error_description": "Missing client_secret"}
             ),
         }
@@ -464,7 +466,7 @@ def handle_client_credentials_grant(params: dict) -> dict:
             "Cache-Control": "no-store",
             "Pragma": "no-cache",
         },
-        "body": json.dumps(token_response),
+        "body": json_dumps(token_response),
     }
 
 
@@ -480,7 +482,7 @@ def handle_registration_request(event: dict) -> dict:
     except json.JSONDecodeError:
         return {
             "statusCode": 400,
-            "body": json.dumps({"error": "invalid_request", "error_description": "Malformed JSON"}),
+            "body": json_dumps({"error": "invalid_request", "error_description": "Malformed JSON"}),
         }
 
     # Generate client credentials
@@ -494,7 +496,7 @@ def handle_registration_request(event: dict) -> dict:
         if not uri.startswith(("https://", "http://localhost")):
             return {
                 "statusCode": 400,
-                "body": json.dumps(
+                "body": json_dumps(
                     {
                         "error": "invalid_redirect_uri",
                         "error_description": f"Invalid redirect URI: {uri}",
@@ -514,7 +516,7 @@ def handle_registration_request(event: dict) -> dict:
     return {
         "statusCode": 201,
         "headers": {"Content-Type": "application/json", "Cache-Control": "no-store"},
-        "body": json.dumps(registration_response),
+        "body": json_dumps(registration_response),
     }
 
 
@@ -522,7 +524,7 @@ def create_error_redirect(redirect_uri: str, error: str, state: str | None = Non
     """Create error redirect response."""
 
     if not redirect_uri:
-        return {"statusCode": 400, "body": json.dumps({"error": error})}
+        return {"statusCode": 400, "body": json_dumps({"error": error})}
 
     error_params = {"error": error}
     if state:
@@ -5,6 +5,7 @@ from typing import Any, Union, get_type_hints
 from loguru import logger
 
 from src.tools.registry import get_tools_by_categories
+from src.utils.serialization import json_dumps
 
 
 def python_type_to_openapi_type(python_type):
@@ -210,7 +211,7 @@ def handle_openai_request(event: dict, categories: list[str] | None = None) -> d
         return {
             "statusCode": 200,
             "headers": {"Content-Type": "application/json", "Access-Control-Allow-Origin": "*"},
-            "body": json.dumps(schema),
+            "body": json_dumps(schema),
         }
 
     # Handle /openai/{function_name} endpoints - execute tools
@@ -233,21 +234,21 @@ def handle_openai_request(event: dict, categories: list[str] | None = None) -> d
             return {
                 "statusCode": 200,
                 "headers": {"Content-Type": "application/json", "Access-Control-Allow-Origin": "*"},
-                "body": json.dumps(response_body),
+                "body": json_dumps(response_body),
             }
 
         except ValueError as e:
             return {
                 "statusCode": 404,
                 "headers": {"Content-Type": "application/json", "Access-Control-Allow-Origin": "*"},
-                "body": json.dumps({"error": str(e)}),
+                "body": json_dumps({"error": str(e)}),
             }
         except Exception as e:
             logger.error(f"Error handling request: {e}")
             return {
                 "statusCode": 500,
                 "headers": {"Content-Type": "application/json", "Access-Control-Allow-Origin": "*"},
-                "body": json.dumps({"error": "Internal server error"}),
+                "body": json_dumps({"error": "Internal server error"}),
             }
 
     # Handle OPTIONS for CORS
@@ -3,7 +3,7 @@ Output handler for Alpha Vantage MCP server.
 
 This module provides async file I/O operations with:
 - Streaming CSV/JSON writing for large datasets
-- Optional gzip compression
+- Optional gzip compression (accelerated by python-isal when installed)
 - Comprehensive metadata generation
 - Robust error handling with retries
 - Path security validation
@@ -11,16 +11,39 @@ This module provides async file I/O operations with:
 
 import asyncio
 import csv
-import gzip
 import hashlib
+import io
 import json
+import os
+import re
+from collections.abc import Iterator
+from contextlib import contextmanager
 from dataclasses import dataclass
 from datetime import UTC, datetime
+from fnmatch import translate
+from operator import itemgetter
 from pathlib import Path
 from typing import Any
 
 import aiofiles
 import aiofiles.os
+import orjson
+
+try:
+    # python-isal (optional): SIMD-accelerated DEFLATE, same gzip file format
+    from isal import igzip as _gzip
+except ImportError:
+    try:
+        # zlib-ng (optional): faster drop-in zlib, same gzip file format
+        from zlib_ng import gzip_ng as _gzip
+    except ImportError:
+        import gzip as _gzip
+
+try:
+    # blake3 (optional): multithreaded SIMD hashing for output_checksum_algo="blake3"
+    import blake3 as _blake3
+except ImportError:
+    _blake3 = None
 
 from ..utils.output_config import OutputConfig
 from ..utils.security import SecurityError, sanitize_filename, validate_safe_path
@@ -51,7 +74,8 @@ class FileMetadata:
         format: File format (csv, json, csv.gz, json.gz).
         compressed: Whether file is gzip compressed.
         rows: Number of data rows (CSV) or elements (JSON).
-        checksum: SHA-256 checksum for data integrity.
+        checksum: Checksum for data integrity.
+        checksum_algo: Algorithm used for checksum ("sha256" or "blake3").
     """
 
     filepath: str
@@ -62,6 +86,7 @@ class FileMetadata:
     compressed: bool
     rows: int
     checksum: str = ""
+    checksum_algo: str = "sha256"
 
 
 @dataclass
@@ -100,6 +125,9 @@ class ProjectInfo:
     last_modified: str
 
 
+_SIZE_UNITS = ("B", "KB", "MB", "GB", "TB", "PB")
+
+
 def _format_size(size_bytes: int) -> str:
     """
     Format file size in human-readable format.
@@ -118,28 +146,384 @@ def _format_size(size_bytes: int) -> str:
         >>> _format_size(1610612736)
         '1.5 GB'
     """
-    for unit in ["B", "KB", "MB", "GB", "TB"]:
-        if size_bytes < 1024.0:
-            return f"{size_bytes:.1f} {unit}"
-        size_bytes /= 1024.0
-    return f"{size_bytes:.1f} PB"
+    # Each unit is 2**10 of the previous one, so the bit length picks it directly
+    idx = min(len(_SIZE_UNITS) - 1, max(0, (size_bytes.bit_length() - 1) // 10))
+    return f"{size_bytes / (1 << (10 * idx)):.1f} {_SIZE_UNITS[idx]}"
+
+
+# Characters of formatted output to collect before each file write
+_WRITE_BUFFER_SIZE = 128 * 1024
+
+# gzip level for compressed output: much faster than the default 9, with output
+# only slightly larger for CSV/JSON market data
+_GZIP_COMPRESSLEVEL = 1
+
+
+def _checksum_algo(config: OutputConfig) -> str:
+    """
+    Checksum algorithm to use for a configuration.
+
+    blake3 is used only when configured and installed; otherwise SHA-256.
+    """
+    if config.output_checksum_algo == "blake3" and _blake3 is not None:
+        return "blake3"
+    return "sha256"
+
+
+def _new_hasher(config: OutputConfig) -> Any:
+    """
+    Create a hash object to feed while writing, or None if metadata is off.
+
+    Args:
+        config: Output configuration.
+
+    Returns:
+        Object with update()/hexdigest() for the configured algorithm, or None.
+    """
+    if not config.output_metadata:
+        return None
+    if _checksum_algo(config) == "blake3":
+        return _blake3.blake3(max_threads=_blake3.blake3.AUTO)
+    return hashlib.sha256()
+
+
+def _file_checksum_sync(filepath: Path, algo: str = "sha256") -> str:
+    """
+    Calculate a file checksum with blocking reads.
+
+    SHA-256 uses hashlib.file_digest, which runs the read-and-update loop in C
+    with a reusable buffer. BLAKE3 memory-maps the file and hashes it on all
+    cores.
+
+    Args:
+        filepath: Path to the file.
+        algo: "sha256" or "blake3" (blake3 must be installed).
+
+    Returns:
+        Hex-encoded checksum.
+    """
+    if algo == "blake3":
+        return _blake3.blake3(max_threads=_blake3.blake3.AUTO).update_mmap(filepath).hexdigest()
+    with open(filepath, "rb", buffering=0) as f:
+        return hashlib.file_digest(f, "sha256").hexdigest()
 
 
-async def _calculate_checksum(filepath: Path) -> str:
+async def _calculate_checksum(filepath: Path, algo: str = "sha256") -> str:
     """
-    Calculate SHA-256 checksum for a file.
+    Calculate a checksum for a file (SHA-256 by default).
+
+    The whole read-and-hash loop runs in one worker thread, rather than one
+    thread hop per chunk as with aiofiles reads.
 
     Args:
         filepath: Path to the file.
+        algo: "sha256" or "blake3" (blake3 must be installed).
+
+    Returns:
+        Hex-encoded checksum.
+    """
+    return await asyncio.to_thread(_file_checksum_sync, filepath, algo)
+
+
+def _row_values(rows: list[dict], headers: list[str]) -> list:
+    """
+    Extract header-ordered values from row dicts for csv.writer.
+
+    Uses a single itemgetter for the common case where every row has every
+    header, falling back to dict.get (empty string for missing keys) otherwise.
+
+    Args:
+        rows: Row dictionaries.
+        headers: Column names, in output order.
+
+    Returns:
+        List of value sequences, one per row.
+    """
+    getter = itemgetter(*headers)
+    try:
+        values = list(map(getter, rows))
+    except KeyError:
+        return [[row.get(h, "") for h in headers] for row in rows]
+    # itemgetter with a single key returns the bare value
+    return [(v,) for v in values] if len(headers) == 1 else values
+
+
+# orjson options matching json.dumps(indent=2): non-string keys are converted,
+# and datetimes/dataclasses are rejected as the stdlib encoder does
+_ORJSON_OPTIONS = (
+    orjson.OPT_INDENT_2
+    | orjson.OPT_NON_STR_KEYS
+    | orjson.OPT_PASSTHROUGH_DATETIME
+    | orjson.OPT_PASSTHROUGH_DATACLASS
+)
+
+
+def _dumps_json(data: Any) -> bytes:
+    """
+    Serialize data to pretty-printed (indent=2) UTF-8 JSON bytes.
+
+    Uses orjson, which produces bytes directly; falls back to json.dumps for
+    the values orjson cannot encode but the stdlib can (e.g. integers beyond
+    64 bits).
+
+    Args:
+        data: Data to serialize.
 
     Returns:
-        Hex-encoded SHA-256 checksum.
+        UTF-8 encoded JSON.
+
+    Raises:
+        TypeError: If data contains non-serializable values.
+        ValueError: If data cannot be encoded (e.g. circular references).
     """
-    sha256_hash = hashlib.sha256()
-    async with aiofiles.open(filepath, "rb") as f:
-        while chunk := await f.read(8192):
-            sha256_hash.update(chunk)
-    return sha256_hash.hexdigest()
+    try:
+        return orjson.dumps(data, option=_ORJSON_OPTIONS)
+    except TypeError:
+        return json.dumps(data, indent=2, ensure_ascii=False).encode("utf-8")
+
+
+class _HashingWriter:
+    """
+    Binary file wrapper that feeds every written byte into a hash.
+
+    Lets compressed output be checksummed as it is written, without reading the
+    finished file back. The wrapped file's name is exposed so gzip records the
+    original filename in its header, as gzip.open does.
+    """
+
+    def __init__(self, raw: io.BufferedWriter, hasher: "hashlib._Hash"):
+        self._raw = raw
+        self._hasher = hasher
+        self.name = raw.name
+
+    def write(self, data: bytes) -> int:
+        self._hasher.update(data)
+        return self._raw.write(data)
+
+    def flush(self) -> None:
+        self._raw.flush()
+
+
+@contextmanager
+def _open_gzip(path: Path, hasher: "hashlib._Hash | None") -> Iterator[io.BufferedIOBase]:
+    """
+    Open a gzip file for binary writing, hashing the compressed bytes.
+
+    Equivalent to gzip.open(path, "wb") at _GZIP_COMPRESSLEVEL, with the bytes
+    reaching disk also fed to hasher (when given).
+
+    Args:
+        path: Output file path.
+        hasher: Hash object updated with the file contents, or None.
+
+    Yields:
+        Binary stream writing into the gzip file.
+    """
+    with open(path, "wb") as raw:
+        fileobj = _HashingWriter(raw, hasher) if hasher is not None else raw
+        with _gzip.GzipFile(fileobj=fileobj, mode="wb", compresslevel=_GZIP_COMPRESSLEVEL) as gz:
+            yield gz
+
+
+@contextmanager
+def _open_gzip_text(
+    path: Path, hasher: "hashlib._Hash | None", newline: str | None = None
+) -> Iterator[io.TextIOWrapper]:
+    """
+    Open a gzip file for UTF-8 text writing, hashing the compressed bytes.
+
+    Args:
+        path: Output file path.
+        hasher: Hash object updated with the file contents, or None.
+        newline: Newline translation, as for open().
+
+    Yields:
+        Text stream writing into the gzip file.
+    """
+    with _open_gzip(path, hasher) as gz:
+        with io.TextIOWrapper(gz, encoding="utf-8", newline=newline) as f:
+            yield f
+
+
+def _write_gzip_csv(path: Path, data: list[dict], hasher: "hashlib._Hash | None") -> None:
+    """
+    Write rows to a gzip-compressed CSV file (blocking; run in a worker thread).
+
+    Rows go to a single writerows call: the text and gzip layers already
+    buffer, so there is nothing to gain from slicing data into chunks.
+
+    Args:
+        path: Output file path.
+        data: Non-empty list of row dictionaries; headers come from the first row.
+        hasher: Hash object updated with the compressed bytes, or None.
+    """
+    with _open_gzip_text(path, hasher) as f:
+        # Get headers from first row
+        headers = list(data[0].keys())
+        writer = csv.DictWriter(f, fieldnames=headers)
+        writer.writeheader()
+        writer.writerows(data)
+
+
+def _write_gzip_bytes(path: Path, content: bytes, hasher: "hashlib._Hash | None") -> None:
+    """
+    Write bytes to a gzip-compressed file (blocking; run in a worker thread).
+
+    Args:
+        path: Output file path.
+        content: Uncompressed content.
+        hasher: Hash object updated with the compressed bytes, or None.
+    """
+    with _open_gzip(path, hasher) as gz:
+        gz.write(content)
+
+
+def _file_format(name: str) -> str:
+    """Format label for a file name: its suffix, or e.g. "csv.gz" for compressed files."""
+    stem, ext = os.path.splitext(name)
+    if ext == ".gz":
+        # Handle .csv.gz, .json.gz
+        inner = os.path.splitext(stem)[1]
+        if inner:
+            return f"{inner[1:]}.gz"
+    return ext[1:]
+
+
+def _walk_files(root: str) -> Iterator[tuple[os.DirEntry, os.stat_result]]:
+    """
+    Recursively yield (entry, stat) for every regular file under a directory.
+
+    Uses os.scandir, whose DirEntry.is_dir()/is_file() are answered from the
+    directory listing itself, so the only per-file syscall is the stat.
+    Symlinked directories are not followed, matching Path.rglob; symlinks to
+    files are reported with the target's stat, as Path.is_file() did.
+    Subdirectories that cannot be opened (unreadable, or removed mid-walk) are
+    skipped like Path.rglob skips them; an error opening root itself propagates.
+
+    Args:
+        root: Directory to walk.
+
+    Yields:
+        Tuples of (DirEntry, stat result).
+    """
+    pending = [root]
+    while pending:
+        path = pending.pop()
+        try:
+            entries = os.scandir(path)
+        except OSError:
+            if path == root:
+                raise
+            # Unreadable or removed since it was listed: skipped, as Path.rglob does
+            continue
+        with entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    pending.append(entry.path)
+                elif entry.is_file():
+                    try:
+                        stat = entry.stat()
+                    except FileNotFoundError:
+                        # Removed between the directory listing and the stat
+                        continue
+                    yield entry, stat
+
+
+def _scan_project_files(project_path: Path, pattern: str) -> list[tuple[int, FileInfo]]:
+    """
+    Walk a project folder and stat matching files (blocking; run in a worker thread).
+
+    Args:
+        project_path: Project folder to search recursively.
+        pattern: Glob pattern for filtering files.
+
+    Returns:
+        List of (mtime in ns, FileInfo) tuples, unsorted.
+    """
+    if "/" in pattern or os.sep in pattern:
+        # Patterns spanning directories need pathlib's full glob semantics
+        matches = (
+            (str(path.relative_to(project_path)), path.stat())
+            for path in project_path.rglob(pattern)
+            if path.is_file()
+        )
+    else:
+        root = str(project_path)
+        prefix_len = len(os.path.join(root, ""))
+        # Compile the pattern once rather than looking it up for every entry
+        match_name = re.compile(translate(pattern)).match
+        matches = (
+            (entry.path[prefix_len:], stat)
+            for entry, stat in _walk_files(root)
+            if match_name(entry.name)
+        )
+
+    file_infos = []
+    for name, stat in matches:
+        file_info = FileInfo(
+            name=name,
+            size=stat.st_size,
+            modified_time=datetime.fromtimestamp(stat.st_mtime, UTC).isoformat(),
+            format=_file_format(name),
+        )
+        file_infos.append((stat.st_mtime_ns, file_info))
+    return file_infos
+
+
+def _tree_stats(root: str) -> tuple[int, int, os.stat_result | None]:
+    """
+    Count files under a directory (blocking; run in a worker thread).
+
+    Args:
+        root: Directory to walk recursively.
+
+    Returns:
+        Tuple of (file count, total size in bytes, stat of the newest file or None).
+    """
+    file_count = 0
+    total_size = 0
+    newest = None
+    newest_ns = -1
+    for _, stat in _walk_files(root):
+        file_count += 1
+        total_size += stat.st_size
+        # Compare integer nanoseconds: exact, and cheaper than float compares
+        if stat.st_mtime_ns > newest_ns:
+            newest, newest_ns = stat, stat.st_mtime_ns
+    return file_count, total_size, newest
+
+
+def _scan_projects(client_root: Path) -> list[tuple[int, ProjectInfo]]:
+    """
+    Collect stats for every project folder (blocking; run in a worker thread).
+
+    Args:
+        client_root: Folder containing the projects.
+
+    Returns:
+        List of (last modified in ns, ProjectInfo) tuples, unsorted.
+    """
+    project_infos = []
+    with os.scandir(client_root) as entries:
+        for entry in entries:
+            # Skip non-directories and hidden folders
+            if not entry.is_dir() or entry.name.startswith("."):
+                continue
+
+            file_count, total_size, newest = _tree_stats(entry.path)
+
+            # Use directory's mtime if no files found
+            if newest is None:
+                newest = entry.stat()
+
+            project_info = ProjectInfo(
+                name=entry.name,
+                file_count=file_count,
+                total_size=total_size,
+                last_modified=datetime.fromtimestamp(newest.st_mtime, UTC).isoformat(),
+            )
+            project_infos.append((newest.st_mtime_ns, project_info))
+    return project_infos
 
 
 async def _retry_operation(operation, max_retries: int = 3, backoff_base: float = 0.5):
@@ -157,15 +541,18 @@ async def _retry_operation(operation, max_retries: int = 3, backoff_base: float
     Raises:
         The last exception encountered if all retries fail.
     """
-    last_exception = None
-    for attempt in range(max_retries):
+    # Fast path: the first attempt almost always succeeds
+    try:
+        return await operation()
+    except Exception as e:
+        last_exception = e
+
+    for attempt in range(1, max_retries):
+        await asyncio.sleep(backoff_base * (2 ** (attempt - 1)))
         try:
             return await operation()
         except Exception as e:
             last_exception = e
-            if attempt < max_retries - 1:
-                delay = backoff_base * (2**attempt)
-                await asyncio.sleep(delay)
 
     raise last_exception
 
@@ -200,6 +587,10 @@ class OutputHandler:
             config: Output configuration.
         """
         self.config = config
+        # client_root is fixed per handler; resolve its symlinks once for containment checks
+        self._client_root_resolved = (
+            config.client_root.resolve() if config.client_root is not None else None
+        )
 
     async def write_csv(
         self, data: list[dict], filepath: Path, config: OutputConfig
@@ -246,54 +637,134 @@ class OutputHandler:
         output_path = safe_path.with_suffix(safe_path.suffix + ".gz") if compress else safe_path
 
         try:
-            # Write CSV with retry logic
+            # Write CSV with retry logic, checksumming the bytes as they are written
             async def _write():
+                hasher = _new_hasher(config)
                 if compress:
-                    # Write to gzip file
-                    with gzip.open(output_path, "wt", encoding="utf-8") as f:
+                    # Compress in a worker thread so the event loop isn't blocked
+                    await asyncio.to_thread(_write_gzip_csv, output_path, data, hasher)
+                else:
+                    # Write to regular file with async I/O (bytes, so the hash
+                    # covers exactly what is written)
+                    async with aiofiles.open(output_path, "wb") as f:
                         # Get headers from first row
                         headers = list(data[0].keys())
-                        writer = csv.DictWriter(f, fieldnames=headers)
-                        writer.writeheader()
 
-                        # Write data in chunks
+                        # csv.writer does the quoting in C; rows collect in an
+                        # in-memory buffer that is flushed to the file once it holds
+                        # _WRITE_BUFFER_SIZE characters, so small chunks don't each
+                        # cost a threadpool round trip
+                        buf = io.StringIO()
+                        writer = csv.writer(buf, lineterminator="\n")
+                        writer.writerow(headers)
+
+                        async def _flush():
+                            block = buf.getvalue().encode("utf-8")
+                            buf.seek(0)
+                            buf.truncate()
+                            if hasher:
+                                hasher.update(block)
+                            await f.write(block)
+
+                        # Write data in chunks. The slice only copies row
+                        # references; _row_values needs a re-iterable chunk for
+                        # its KeyError fallback
                         chunk_size = config.streaming_chunk_size
                         for i in range(0, len(data), chunk_size):
-                            chunk = data[i : i + chunk_size]
-                            writer.writerows(chunk)
-                else:
-                    # Write to regular file with async I/O
-                    async with aiofiles.open(output_path, "w", encoding="utf-8") as f:
-                        # Get headers from first row
-                        headers = list(data[0].keys())
+                            writer.writerows(_row_values(data[i : i + chunk_size], headers))
+                            if buf.tell() >= _WRITE_BUFFER_SIZE:
+                                await _flush()
+                        await _flush()
+                return hasher.hexdigest() if hasher else None
 
-                        # Write header
-                        await f.write(",".join(headers) + "\n")
+            checksum = await _retry_operation(_write, max_retries=3)
 
-                        # Write data in chunks
-                        chunk_size = config.streaming_chunk_size
-                        for i in range(0, len(data), chunk_size):
-                            chunk = data[i : i + chunk_size]
-                            # Convert chunk to CSV lines
-                            lines = []
-                            for row in chunk:
-                                values = [str(row.get(h, "")) for h in headers]
-                                # Escape commas and quotes
-                                escaped_values = []
-                                for v in values:
-                                    if "," in v or '"' in v or "\n" in v:
-                                        escaped_values.append(
-                                            f'"{v.replace(chr(34), chr(34) + chr(34))}"'
-                                        )
-                                    else:
-                                        escaped_values.append(v)
-                                lines.append(",".join(escaped_values))
-                            await f.write("\n".join(lines) + "\n")
-
-            await _retry_operation(_write, max_retries=3)
+            # Generate metadata
+            metadata = await self._generate_metadata(
+                output_path, len(data), compress, config, checksum=checksum
+            )
+            return metadata
+
+        except Exception as e:
+            # Cleanup partial file on error
+            if output_path.exists():
+                try:
+                    await aiofiles.os.remove(output_path)
+                except Exception:
+                    pass  # Best effort cleanup
+
+            raise FileWriteError(
+                f"Failed to write CSV file {output_path}: {e}. Check disk space and permissions."
+            ) from e
+
+    async def write_csv_text(
+        self, csv_text: str, row_count: int, filepath: Path, config: OutputConfig
+    ) -> FileMetadata:
+        """
+        Write already-serialized CSV text to file as-is.
+
+        Used when the data arrived as CSV (e.g. an Alpha Vantage response), which
+        avoids re-serializing parsed rows back to CSV.
+
+        Features:
+        - Async file I/O using aiofiles
+        - Optional gzip compression
+        - Line endings preserved exactly as given
+
+        Args:
+            csv_text: CSV content including header line.
+            row_count: Number of data rows, recorded in metadata.
+            filepath: Target file path (relative to client_root).
+            config: Output configuration.
+
+        Returns:
+            FileMetadata with file information.
+
+        Raises:
+            FileWriteError: If write operation fails after retries.
+            ValueError: If csv_text is empty.
+
+        Examples:
+            >>> csv_text = "name,age\\nAlice,30\\nBob,25\\n"
+            >>> metadata = await handler.write_csv_text(csv_text, 2, Path("users.csv"), config)
+            >>> metadata.rows
+            2
+        """
+        if not csv_text:
+            raise ValueError("Cannot write empty data to CSV")
+
+        # Validate and secure the path (without permission check yet)
+        safe_path = validate_safe_path(filepath, config.client_root, check_permissions=False)
+
+        # Ensure parent directory exists
+        safe_path.parent.mkdir(parents=True, exist_ok=True)
+
+        # Determine if we should compress
+        compress = config.output_compression
+        output_path = safe_path.with_suffix(safe_path.suffix + ".gz") if compress else safe_path
+
+        try:
+            # Write CSV text with retry logic (line endings untouched), checksumming
+            # the bytes as they are written
+            async def _write():
+                hasher = _new_hasher(config)
+                content = csv_text.encode("utf-8")
+                if compress:
+                    # Compress in a worker thread so the event loop isn't blocked
+                    await asyncio.to_thread(_write_gzip_bytes, output_path, content, hasher)
+                else:
+                    if hasher:
+                        hasher.update(content)
+                    async with aiofiles.open(output_path, "wb") as f:
+                        await f.write(content)
+                return hasher.hexdigest() if hasher else None
+
+            checksum = await _retry_operation(_write, max_retries=3)
 
             # Generate metadata
-            metadata = await self._generate_metadata(output_path, len(data), compress, config)
+            metadata = await self._generate_metadata(
+                output_path, row_count, compress, config, checksum=checksum
+            )
             return metadata
 
         except Exception as e:
@@ -348,39 +819,38 @@ class OutputHandler:
         output_path = safe_path.with_suffix(safe_path.suffix + ".gz") if compress else safe_path
 
         try:
+            # Count elements while the container type is at hand
+            element_count = len(data) if isinstance(data, list | dict) else 1
+
             # Serialize data first to catch serialization errors early
             try:
-                json_str = json.dumps(data, indent=2, ensure_ascii=False)
+                content = _dumps_json(data)
             except (TypeError, ValueError) as e:
                 raise ValueError(
                     f"Cannot serialize data to JSON: {e}. "
                     "Ensure all data is JSON-serializable (no datetime, Decimal, etc.)."
                 ) from e
 
-            # Write JSON with retry logic
+            # Write JSON with retry logic, checksumming the bytes as they are written
             async def _write():
+                hasher = _new_hasher(config)
                 if compress:
-                    # Write to gzip file
-                    with gzip.open(output_path, "wt", encoding="utf-8") as f:
-                        f.write(json_str)
+                    # Compress in a worker thread so the event loop isn't blocked
+                    await asyncio.to_thread(_write_gzip_bytes, output_path, content, hasher)
                 else:
                     # Write to regular file with async I/O
-                    async with aiofiles.open(output_path, "w", encoding="utf-8") as f:
-                        await f.write(json_str)
-
-            await _retry_operation(_write, max_retries=3)
+                    if hasher:
+                        hasher.update(content)
+                    async with aiofiles.open(output_path, "wb") as f:
+                        await f.write(content)
+                return hasher.hexdigest() if hasher else None
 
-            # Count elements
-            element_count = 0
-            if isinstance(data, list):
-                element_count = len(data)
-            elif isinstance(data, dict):
-                element_count = len(data)
-            else:
-                element_count = 1
+            checksum = await _retry_operation(_write, max_retries=3)
 
             # Generate metadata
-            metadata = await self._generate_metadata(output_path, element_count, compress, config)
+            metadata = await self._generate_metadata(
+                output_path, element_count, compress, config, checksum=checksum
+            )
             return metadata
 
         except ValueError:
@@ -399,7 +869,12 @@ class OutputHandler:
             ) from e
 
     async def _generate_metadata(
-        self, filepath: Path, row_count: int, compressed: bool, config: OutputConfig
+        self,
+        filepath: Path,
+        row_count: int,
+        compressed: bool,
+        config: OutputConfig,
+        checksum: str | None = None,
     ) -> FileMetadata:
         """
         Generate comprehensive metadata for a file.
@@ -409,6 +884,8 @@ class OutputHandler:
             row_count: Number of rows/elements in the file.
             compressed: Whether file is compressed.
             config: Output configuration.
+            checksum: Checksum of the file computed while writing it, if available
+                (otherwise the file is read back to compute it).
 
         Returns:
             FileMetadata with all information.
@@ -417,10 +894,12 @@ class OutputHandler:
         stat = await aiofiles.os.stat(filepath)
         size_bytes = stat.st_size
 
-        # Calculate checksum if metadata is enabled
-        checksum = ""
-        if config.output_metadata:
-            checksum = await _calculate_checksum(filepath)
+        # Calculate checksum if metadata is enabled (unless computed during the write)
+        checksum_algo = _checksum_algo(config)
+        if not config.output_metadata:
+            checksum = ""
+        elif checksum is None:
+            checksum = await _calculate_checksum(filepath, checksum_algo)
 
         # Determine format
         suffix = filepath.suffix
@@ -447,6 +926,7 @@ class OutputHandler:
             compressed=compressed,
             rows=row_count,
             checksum=checksum,
+            checksum_algo=checksum_algo,
         )
 
     async def create_file_reference(self, filepath: Path, metadata: FileMetadata) -> dict:
@@ -593,31 +1073,11 @@ class OutputHandler:
             raise ValueError(f"Path exists but is not a directory: {project_path}")
 
         try:
-            # Collect all matching files
-            file_infos = []
-
-            # Use rglob for recursive glob matching
-            for file_path in project_path.rglob(pattern):
-                if file_path.is_file():
-                    stat = await aiofiles.os.stat(file_path)
-
-                    # Determine file format
-                    suffix = file_path.suffix.lstrip(".")
-                    if file_path.suffixes and len(file_path.suffixes) >= 2:
-                        # Handle .csv.gz, .json.gz
-                        if file_path.suffixes[-1] == ".gz":
-                            suffix = f"{file_path.suffixes[-2].lstrip('.')}.gz"
-
-                    file_info = FileInfo(
-                        name=str(file_path.relative_to(project_path)),
-                        size=stat.st_size,
-                        modified_time=datetime.fromtimestamp(stat.st_mtime, UTC).isoformat(),
-                        format=suffix,
-                    )
-                    file_infos.append((stat.st_mtime, file_info))
+            # Walk and stat in one worker thread rather than one dispatch per file
+            file_infos = await asyncio.to_thread(_scan_project_files, project_path, pattern)
 
             # Sort by modified time (newest first) and return FileInfo objects
-            file_infos.sort(key=lambda x: x[0], reverse=True)
+            file_infos.sort(key=itemgetter(0), reverse=True)
             return [info for _, info in file_infos]
 
         except PermissionError as e:
@@ -680,10 +1140,12 @@ class OutputHandler:
         # Construct file path and validate it's contained within project
         file_path = project_path / safe_filename
 
-        # Security validation - ensure file path is within project folder
+        # Security validation - ensure file path is within project folder.
+        # The sanitized project name has no separators, so the project folder
+        # is simply the resolved root joined with it.
         try:
             resolved_file = file_path.resolve(strict=False)
-            resolved_project = project_path.resolve(strict=True)
+            resolved_project = self._client_root_resolved / safe_project_name
 
             if not resolved_file.is_relative_to(resolved_project):
                 raise SecurityError(
@@ -746,43 +1208,11 @@ class OutputHandler:
             1048576
         """
         try:
-            project_infos = []
-
-            # Iterate through directories in client_root
-            for item in self.config.client_root.iterdir():
-                # Skip non-directories and hidden folders
-                if not item.is_dir() or item.name.startswith("."):
-                    continue
-
-                # Calculate project stats
-                file_count = 0
-                total_size = 0
-                last_modified = 0
-
-                # Recursively count files and sizes
-                for file_path in item.rglob("*"):
-                    if file_path.is_file():
-                        stat = await aiofiles.os.stat(file_path)
-                        file_count += 1
-                        total_size += stat.st_size
-                        last_modified = max(last_modified, stat.st_mtime)
-
-                # Use directory's mtime if no files found
-                if last_modified == 0:
-                    stat = await aiofiles.os.stat(item)
-                    last_modified = stat.st_mtime
-
-                project_info = ProjectInfo(
-                    name=item.name,
-                    file_count=file_count,
-                    total_size=total_size,
-                    last_modified=datetime.fromtimestamp(last_modified, UTC).isoformat(),
-                )
-
-                project_infos.append((last_modified, project_info))
+            # Walk and stat in one worker thread rather than one dispatch per file
+            project_infos = await asyncio.to_thread(_scan_projects, self.config.client_root)
 
             # Sort by last modified time (newest first) and return ProjectInfo objects
-            project_infos.sort(key=lambda x: x[0], reverse=True)
+            project_infos.sort(key=itemgetter(0), reverse=True)
             return [info for _, info in project_infos]
 
         except PermissionError as e:
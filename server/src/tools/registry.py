@@ -2,6 +2,8 @@ import functools
 import inspect
 from typing import Union, get_type_hints
 
+from src.context import default_params_context, set_entitlement
+
 # Tool module mapping with lazy imports
 # NOTE: Old individual tool modules have been replaced by unified tools in Sprint 3
 TOOL_MODULES = {
@@ -105,17 +107,13 @@ def add_entitlement_parameter(func):
         # Extract entitlement if provided - it will be passed through params to _make_api_request
         entitlement = kwargs.pop("entitlement", None)
 
-        # Call the original function, passing entitlement through a global variable
+        # Call the original function with entitlement added to the request context
         if entitlement:
-            # Set global variable that _make_api_request can check
-            import src.common
-
-            src.common._current_entitlement = entitlement
+            token = set_entitlement(entitlement)
             try:
-                result = func(*args, **kwargs)
+                return func(*args, **kwargs)
             finally:
-                src.common._current_entitlement = None
-            return result
+                default_params_context.reset(token)
 
         return func(*args, **kwargs)
 
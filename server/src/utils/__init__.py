@@ -6,9 +6,13 @@ This package exports commonly used utility functions.
 
 import hashlib
 import json
+import os
 import time
+from functools import cache
 from typing import Any
 
+from src.utils.serialization import json_dumps
+
 __all__ = [
     "estimate_tokens",
     "generate_r2_key",
@@ -20,6 +24,9 @@ __all__ = [
     "parse_tool_categories_from_request",
 ]
 
+# Request paths that never carry a tool category
+_ROOT_PATHS = frozenset({"", "/", "/mcp"})
+
 
 def estimate_tokens(data: Any) -> int:
     """Estimate the number of tokens in a data structure.
@@ -43,6 +50,35 @@ def generate_r2_key(data: str) -> str:
     return f"alphavantage-responses/{timestamp}-{data_hash}.json"
 
 
+@cache
+def _get_r2_client() -> tuple[Any, str, str]:
+    """Create the R2 client and read its settings from the environment once.
+
+    boto3 clients are thread-safe and costly to build, and the R2 environment is
+    fixed for the life of the process.
+
+    Returns:
+        Tuple of (S3 client, default bucket name, public domain)
+
+    Raises:
+        ImportError: If boto3 is not installed
+    """
+    import boto3
+
+    # Initialize R2 client using S3-compatible API
+    # R2 requires specific endpoint and credentials
+    client = boto3.client(
+        "s3",
+        endpoint_url=os.environ.get("R2_ENDPOINT_URL"),
+        aws_access_key_id=os.environ.get("R2_ACCESS_KEY_ID"),
+        aws_secret_access_key=os.environ.get("R2_SECRET_ACCESS_KEY"),
+        region_name="auto",
+    )
+    bucket = os.environ.get("R2_BUCKET", "alphavantage-mcp-responses")
+    r2_domain = os.environ.get("R2_PUBLIC_DOMAIN", "https://data.alphavantage-mcp.com")
+    return client, bucket, r2_domain
+
+
 def upload_to_r2(data: str, bucket_name: str = None) -> str | None:
     """Upload data to Cloudflare R2 and return a public URL.
 
@@ -53,29 +89,12 @@ def upload_to_r2(data: str, bucket_name: str = None) -> str | None:
     Returns:
         Public URL to access the data, or None if upload fails
     """
-    import os
-
     try:
-        import boto3
-    except ImportError:
-        return None
+        # Shared client (None is returned below if boto3 is missing)
+        r2_client, default_bucket, r2_domain = _get_r2_client()
 
-    try:
-        # Get bucket name from environment or use default
-        bucket = bucket_name or os.environ.get("R2_BUCKET", "alphavantage-mcp-responses")
-
-        # Get R2 public domain from environment
-        r2_domain = os.environ.get("R2_PUBLIC_DOMAIN", "https://data.alphavantage-mcp.com")
-
-        # Initialize R2 client using S3-compatible API
-        # R2 requires specific endpoint and credentials
-        r2_client = boto3.client(
-            "s3",
-            endpoint_url=os.environ.get("R2_ENDPOINT_URL"),
-            aws_access_key_id=os.environ.get("R2_ACCESS_KEY_ID"),
-            aws_secret_access_key=os.environ.get("R2_SECRET_ACCESS_KEY"),
-            region_name="auto",
-        )
+        # Use the given bucket or the one from the environment
+        bucket = bucket_name or default_bucket
 
         # Generate unique key
         key = generate_r2_key(data)
@@ -118,7 +137,7 @@ def create_oauth_error_response(error_dict: dict, status_code: int = 401) -> dic
             "Access-Control-Allow-Headers": "Content-Type,Authorization",
             "Access-Control-Allow-Methods": "GET,POST,PUT,DELETE,OPTIONS",
         },
-        "body": json.dumps(error_dict),
+        "body": json_dumps(error_dict),
     }
 
 
@@ -134,15 +153,18 @@ def parse_token_from_request(event: dict) -> str:
             pass
 
     # Check query parameters second
-    query_params = event.get("queryStringParameters") or {}
-    if "apikey" in query_params and query_params["apikey"]:
-        return query_params["apikey"]
-
-    # Fallback to Authorization header
-    headers = event.get("headers", {})
-    auth_header = headers.get("Authorization") or headers.get("authorization")
-    if auth_header and auth_header.startswith("Bearer "):
-        return auth_header[7:]  # Remove 'Bearer ' prefix
+    query_params = event.get("queryStringParameters")
+    if query_params:
+        apikey = query_params.get("apikey")
+        if apikey:
+            return apikey
+
+    # Fallback to Authorization header (Function URLs and HTTP APIs lowercase header names)
+    headers = event.get("headers")
+    if headers:
+        auth_header = headers.get("authorization") or headers.get("Authorization")
+        if auth_header and auth_header[:7] == "Bearer ":
+            return auth_header[7:]  # Remove 'Bearer ' prefix
     return ""
 
 
@@ -152,30 +174,35 @@ def parse_tool_categories_from_request(event: dict) -> list[str] | None:
     query_params = event.get("queryStringParameters") or {}
 
     # Check for categories in query parameters first (new method)
-    if "categories" in query_params and query_params["categories"]:
-        categories = [cat.strip() for cat in query_params["categories"].split(",") if cat.strip()]
+    categories_param = query_params.get("categories")
+    if categories_param:
+        categories = list(filter(None, map(str.strip, categories_param.split(","))))
         return categories if categories else None
 
+    # Root MCP paths (the common case) carry no category
+    if path in _ROOT_PATHS:
+        return None
+
     # Don't parse categories from OpenAI paths
     if path.startswith("/openai"):
         return None
 
     # Fallback to path-based parsing (backwards compatibility)
-    if not path or path == "/" or path == "/mcp":
-        return None
-
-    # Remove leading slash and extract path segments
-    path_parts = path.lstrip("/").split("/")
-
-    # Handle /mcp root path - category is second segment
-    if len(path_parts) >= 2 and path_parts[0] == "mcp" and path_parts[1]:
-        return [path_parts[1]]
+    # Locate segments by index rather than splitting the whole path into a list
+    path = path.lstrip("/")
+    first_end = path.find("/")
+    first = path if first_end == -1 else path[:first_end]
 
     # Handle direct category path (backwards compatibility)
-    if len(path_parts) > 0 and path_parts[0] and path_parts[0] != "mcp":
-        return [path_parts[0]]
+    if first != "mcp":
+        return [first] if first else None
 
-    return None
+    # Handle /mcp root path - category is second segment
+    if first_end == -1:
+        return None
+    second_end = path.find("/", first_end + 1)
+    second = path[first_end + 1 :] if second_end == -1 else path[first_end + 1 : second_end]
+    return [second] if second else None
 
 
 def extract_client_platform(event: dict) -> str:
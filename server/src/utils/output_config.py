@@ -65,6 +65,7 @@ class OutputConfig(BaseSettings):
         MCP_OUTPUT_FORMAT: Optional. Default output format (default: "csv").
         MCP_OUTPUT_COMPRESSION: Optional. Enable gzip compression (default: false).
         MCP_OUTPUT_METADATA: Optional. Include metadata in responses (default: true).
+        MCP_OUTPUT_CHECKSUM_ALGO: Optional. Checksum algorithm, sha256 or blake3 (default: sha256).
         MCP_STREAMING_CHUNK_SIZE: Optional. Chunk size for streaming (default: 10000).
         MCP_DEFAULT_FOLDER_PERMISSIONS: Optional. Folder permission mode (default: 0o755).
 
@@ -117,6 +118,11 @@ class OutputConfig(BaseSettings):
 
     output_metadata: bool = Field(default=True, description="Include metadata in responses.")
 
+    output_checksum_algo: Literal["sha256", "blake3"] = Field(
+        default="sha256",
+        description="Checksum algorithm for file metadata. blake3 requires the blake3 package.",
+    )
+
     streaming_chunk_size: int = Field(
         default=10000, description="Chunk size for streaming. Must be between 100 and 100,000."
     )
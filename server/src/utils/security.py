@@ -12,6 +12,7 @@ All functions raise appropriate exceptions with actionable error messages.
 import os
 import re
 from datetime import UTC
+from functools import lru_cache
 from pathlib import Path
 
 
@@ -188,6 +189,17 @@ def sanitize_filename(filename: str) -> str:
     if not filename or not isinstance(filename, str):
         return "unnamed_file"
 
+    return _sanitize_filename(filename)
+
+
+@lru_cache(maxsize=1024)
+def _sanitize_filename(filename: str) -> str:
+    """
+    Sanitize a non-empty filename string (see sanitize_filename).
+
+    The result depends only on the input, so it is memoized: handlers
+    re-sanitize the same project and file names on every request.
+    """
     # Remove null bytes (security risk)
     filename = filename.replace("\x00", "")
 
@@ -0,0 +1,28 @@
+"""
+JSON serialization helpers for Alpha Vantage MCP server.
+
+This module wraps orjson for the hot response paths. Lambda/API Gateway
+response bodies must be str, so encoded bytes are decoded once here.
+"""
+
+from typing import Any
+
+import orjson
+
+# Match stdlib json.dumps, which accepts int/float/bool/None dict keys
+_DUMPS_OPTIONS = orjson.OPT_NON_STR_KEYS
+
+
+def json_dumps(obj: Any) -> str:
+    """Serialize obj to a compact JSON string using orjson.
+
+    Args:
+        obj: JSON-serializable object
+
+    Returns:
+        JSON document as str
+
+    Raises:
+        TypeError: If obj contains a type orjson cannot serialize
+    """
+    return orjson.dumps(obj, option=_DUMPS_OPTIONS).decode()
@@ -14,6 +14,8 @@ Target: ≥90% code coverage
 """
 
 import os
+import subprocess
+import sys
 import time
 from datetime import date, datetime
 from decimal import Decimal
@@ -22,7 +24,12 @@ from tempfile import TemporaryDirectory
 
 import pytest
 
-from src.decision.token_estimator import TokenEstimationError, TokenEstimator
+from src.decision import token_estimator
+from src.decision.token_estimator import (
+    TokenEstimationError,
+    TokenEstimator,
+    get_default_estimator,
+)
 from src.utils.output_config import OutputConfig
 
 
@@ -42,6 +49,29 @@ class TestTokenEstimatorInitialization:
         encoding2 = estimator.encoding
         assert encoding1 is encoding2  # Same instance
 
+    def test_encoding_shared_across_instances(self):
+        """Test that all estimators share one process-wide encoding."""
+        assert TokenEstimator().encoding is TokenEstimator().encoding
+
+    def test_import_does_not_load_tiktoken(self):
+        """Test that tiktoken is only imported once an encoding is needed."""
+        result = subprocess.run(
+            [
+                sys.executable,
+                "-c",
+                "import sys, src.decision.token_estimator; print('tiktoken' in sys.modules)",
+            ],
+            cwd=Path(__file__).resolve().parents[2],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        assert result.stdout.strip() == "False"
+
+    def test_default_estimator_is_singleton(self):
+        """Test that get_default_estimator returns the same instance."""
+        assert get_default_estimator() is get_default_estimator()
+
 
 class TestEstimateTokensBasic:
     """Test basic token estimation functionality."""
@@ -98,6 +128,166 @@ class TestEstimateTokensBasic:
             self.estimator.estimate_csv_tokens([])
 
 
+class TestTokenCountCache:
+    """Test content-fingerprint caching of token counts."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.estimator = TokenEstimator()
+
+    def test_repeated_payload_skips_encoding(self, monkeypatch):
+        """Test that identical content is only BPE-encoded once."""
+        data = {"symbol": "IBM", "note": "cache-test-repeated-payload"}
+        first = self.estimator.estimate_json_tokens(data)
+
+        def fail_encode(_text):
+            raise AssertionError("cached content should not be re-encoded")
+
+        monkeypatch.setattr(self.estimator, "encoding", type("E", (), {"encode": fail_encode}))
+
+        assert self.estimator.estimate_json_tokens(data) == first
+
+    def test_different_payloads_counted_separately(self):
+        """Test that distinct content gets its own count."""
+        short = self.estimator.estimate_json_tokens({"k": "cache-test-a"})
+        long = self.estimator.estimate_json_tokens({"k": "cache-test-a " * 50})
+        assert long > short
+
+    def test_eviction_is_lru_and_thread_safe(self, monkeypatch):
+        """Test that concurrent callers share a bounded cache that evicts least recently used."""
+        from concurrent.futures import ThreadPoolExecutor
+
+        monkeypatch.setattr(
+            token_estimator, "_TOKEN_COUNT_CACHE", type(token_estimator._TOKEN_COUNT_CACHE)()
+        )
+        monkeypatch.setattr(token_estimator, "_TOKEN_COUNT_CACHE_SIZE", 8)
+        texts = [f"payload {i} " * 5 for i in range(64)]
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            counts = list(pool.map(self.estimator._count_tokens, texts * 4))
+
+        assert counts == [len(self.estimator.encoding.encode_ordinary(t)) for t in texts * 4]
+        assert len(token_estimator._TOKEN_COUNT_CACHE) == 8
+
+        # A hit refreshes the entry, so the next insert evicts a different one
+        cache = token_estimator._TOKEN_COUNT_CACHE
+        oldest = next(iter(cache))
+        self.estimator._count_tokens(
+            next(t for t in texts if token_estimator._fingerprint(t) == oldest)
+        )
+        self.estimator._count_tokens("a brand new payload")
+        assert oldest in cache
+
+
+class TestRawTextEstimation:
+    """Test token counting on raw response text."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.estimator = TokenEstimator()
+
+    def test_estimate_tokens_from_str(self):
+        """Test that raw text is counted directly with tiktoken."""
+        text = "timestamp,open,close\n2024-01-01,100.0,101.5\n"
+        assert self.estimator.estimate_tokens_from_str(text) == len(
+            self.estimator.encoding.encode(text)
+        )
+
+    def test_raw_text_used_for_decision(self, monkeypatch):
+        """Test that should_output_to_file counts raw_text instead of re-serializing."""
+
+        def fail_serialize(_data):
+            raise AssertionError("raw_text should be counted instead")
+
+        monkeypatch.setattr(self.estimator, "_serialize_for_tokens", fail_serialize)
+        raw_text = "a\n" + "12345\n" * 400
+        with TemporaryDirectory() as tmpdir:
+            os.environ["MCP_OUTPUT_DIR"] = tmpdir
+            try:
+                config = OutputConfig()
+                should_file, tokens, _ = self.estimator.should_output_to_file(
+                    [{"a": "12345"}] * 400, config, raw_text=raw_text
+                )
+            finally:
+                del os.environ["MCP_OUTPUT_DIR"]
+
+        assert tokens == self.estimator.estimate_tokens_from_str(raw_text)
+
+    def test_small_raw_text_skips_tokenizer(self, monkeypatch):
+        """Test that raw text no larger than the threshold in bytes is not tokenized."""
+
+        def fail_count(_text):
+            raise AssertionError("small raw_text should not be tokenized")
+
+        monkeypatch.setattr(self.estimator, "_count_tokens", fail_count)
+        with TemporaryDirectory() as tmpdir:
+            os.environ["MCP_OUTPUT_DIR"] = tmpdir
+            try:
+                config = OutputConfig()
+                should_file, tokens, reason = self.estimator.should_output_to_file(
+                    [{"a": "1"}], config, raw_text="a\n1\n"
+                )
+            finally:
+                del os.environ["MCP_OUTPUT_DIR"]
+
+        assert should_file is False
+        assert tokens == 1
+        assert "Below threshold" in reason
+
+    def test_raw_text_ignored_for_huge_datasets(self, monkeypatch):
+        """Test that huge datasets keep using row-based fallback estimation."""
+        data = [{"id": i} for i in range(TokenEstimator.FALLBACK_THRESHOLD + 1)]
+        raw_text = "id\n" + "".join(f"{row['id']}\n" for row in data)
+        with TemporaryDirectory() as tmpdir:
+            os.environ["MCP_OUTPUT_DIR"] = tmpdir
+            try:
+                config = OutputConfig()
+                _, tokens, _ = self.estimator.should_output_to_file(data, config, raw_text=raw_text)
+            finally:
+                del os.environ["MCP_OUTPUT_DIR"]
+
+        assert tokens == self.estimator.estimate_by_rows(data)
+
+
+class TestBatchTokenCounting:
+    """Test chunked encode_ordinary_batch counting for large texts."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.estimator = TokenEstimator()
+
+    def test_chunks_rejoin_to_original(self, monkeypatch):
+        """Test that splitting preserves the text exactly."""
+        monkeypatch.setattr(token_estimator, "_BATCH_CHUNK_CHARS", 50)
+        text = "timestamp,open\r\n" + "2024-01-01,100.0\r\n" * 100
+
+        chunks = token_estimator._split_for_batch(text)
+
+        assert len(chunks) > 1
+        assert "".join(chunks) == text
+
+    def test_batch_count_matches_single_pass(self, monkeypatch):
+        """Test that chunked counting gives the same total as encoding in one pass."""
+        monkeypatch.setattr(token_estimator, "_BATCH_CHUNK_CHARS", 64)
+        text = "\n".join(
+            f'    "2024-01-{i:02d}": {{"1. open": "{i * 1.5}",\n\n  "note": "x y"}},'
+            for i in range(80)
+        )
+
+        expected = len(self.estimator.encoding.encode_ordinary(text))
+
+        assert self.estimator.estimate_tokens_from_str(text) == expected
+
+    def test_batch_count_matches_with_whitespace_only_lines(self, monkeypatch):
+        """Test that splits never fall inside runs of whitespace-only lines."""
+        monkeypatch.setattr(token_estimator, "_BATCH_CHUNK_CHARS", 64)
+        text = "".join(f'"row {i}": {i}' + ("\n \n" if i % 2 else "\n\t\n") for i in range(200))
+
+        expected = len(self.estimator.encoding.encode_ordinary(text))
+
+        assert self.estimator.estimate_tokens_from_str(text) == expected
+
+
 class TestEstimateByRowsFallback:
     """Test row-based fallback estimation."""
 
@@ -135,6 +325,17 @@ class TestEstimateByRowsFallback:
 
         assert tokens > 0
 
+    def test_fallback_does_not_serialize_sample(self, monkeypatch):
+        """Test that row sampling works from value lengths, not JSON serialization."""
+
+        def fail_serialize(_data):
+            raise AssertionError("fallback should not serialize the sample")
+
+        monkeypatch.setattr(self.estimator, "_serialize_for_tokens", fail_serialize)
+        data = [{"id": i, "value": f"test_{i}"} for i in range(100)]
+
+        assert self.estimator.estimate_by_rows(data) > 0
+
     def test_fallback_empty_data_raises_error(self):
         """Test that fallback estimation rejects empty data."""
         with pytest.raises(ValueError, match="Cannot estimate tokens for empty data"):
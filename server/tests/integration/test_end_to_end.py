@@ -23,7 +23,11 @@ Test Coverage:
 Target Coverage: ≥90% of integration code
 """
 
+import csv
+import io
+import os
 import tempfile
+from dataclasses import FrozenInstanceError, asdict
 from pathlib import Path
 
 import pytest
@@ -35,7 +39,7 @@ from src.integration import (
     create_inline_response,
     should_use_output_helper,
 )
-from src.output.handler import OutputHandler
+from src.output.handler import FileMetadata, OutputHandler
 from src.utils.output_config import OutputConfig
 from src.utils.security import SecurityError
 
@@ -155,7 +159,7 @@ class TestEndToEndWorkflows:
         # Verify override worked
         assert decision.use_file is False, "Should force inline"
         assert "Forced to inline" in decision.reason
-        assert decision.token_count > test_config.output_token_threshold
+        assert decision.token_count == 0, "Forced decisions skip token estimation"
 
         # Create inline response
         response = create_inline_response(large_dataset, format="csv")
@@ -177,7 +181,7 @@ class TestEndToEndWorkflows:
         # Verify override worked
         assert decision.use_file is True, "Should force file"
         assert "Forced to file" in decision.reason
-        assert decision.token_count < test_config.output_token_threshold
+        assert decision.token_count == 0, "Forced decisions skip token estimation"
 
         # Write to file
         filepath = test_config.client_root / decision.suggested_filename
@@ -286,6 +290,11 @@ class TestEndToEndWorkflows:
         assert "metadata" in response
         assert response["metadata"]["checksum"]
         assert response["metadata"]["rows"] == 200
+        assert response["metadata"] == asdict(metadata)
+
+        # The response holds its own copy of the metadata fields
+        response["metadata"]["rows"] = 0
+        assert metadata.rows == 200
 
     # Test 10: Metadata disabled workflow
     @pytest.mark.asyncio
@@ -363,12 +372,102 @@ class TestEdgeCases:
         response = create_inline_response(data, format="json")
         assert response["data"] == data
 
+    @pytest.mark.parametrize("force", ["force_inline", "force_file"])
+    def test_forced_decision_skips_estimator(self, test_config, monkeypatch, force):
+        """Test that override flags decide without running the token estimator."""
+        from src.integration import helpers
+
+        def fail_estimator():
+            raise AssertionError("forced decisions should not estimate tokens")
+
+        monkeypatch.setattr(helpers, "get_default_estimator", fail_estimator)
+
+        decision = should_use_output_helper([{"id": 1}], test_config, **{force: True})
+
+        assert decision.use_file is (force == "force_file")
+        assert decision.token_count == 0
+
+    def test_decision_is_immutable(self, test_config):
+        """Test that OutputDecision is frozen and has no per-instance dict."""
+        decision = should_use_output_helper([{"id": 1}], test_config)
+
+        with pytest.raises(FrozenInstanceError):
+            decision.use_file = True
+        assert not hasattr(decision, "__dict__")
+
     def test_custom_filename_prefix(self, test_config):
         """Test custom filename prefix."""
         data = [{"id": 1}]
         decision = should_use_output_helper(data, test_config, filename_prefix="stocks")
         assert decision.suggested_filename.startswith("stocks_")
 
+    def test_timestamps_are_utc_and_consistent(self, test_config):
+        """Test that decision filenames and inline timestamps share the same UTC clock."""
+        from datetime import UTC, datetime
+
+        decision = should_use_output_helper([{"id": 1}], test_config, filename_prefix="t")
+        response = create_inline_response([{"id": 1}], format="json")
+
+        stamp = datetime.fromisoformat(response["timestamp"])
+        assert stamp.tzinfo == UTC
+        assert abs((datetime.now(UTC) - stamp).total_seconds()) < 5
+        filename_stamp = datetime.strptime(decision.suggested_filename[2:19], "%Y-%m-%d_%H%M%S")
+        assert abs((stamp.replace(tzinfo=None) - filename_stamp).total_seconds()) < 5
+
+    @pytest.mark.parametrize(
+        "data",
+        [
+            [{"timestamp": "2024-01-02", "open": "101.5"}, {"timestamp": "2024-01-01", "open": ""}],
+            [{"id": 1, "score": 2.5}, {"id": -3, "score": 1e20}],
+            [{"name": "Alice, Jr.", "desc": 'Says "Hi"'}],
+            [{"name": "Bob\nSmith", "desc": None}],
+            [{"name": "Carol\rSmith", "desc": "x"}],
+            [{"id": 1, "ok": True}],
+            [{"id": "1", "extra": "x"}, {"id": "2"}],
+            [{"value": ""}],
+        ],
+    )
+    def test_inline_csv_matches_dictwriter(self, data):
+        """Test that inline CSV output is identical to csv.DictWriter output."""
+        expected = io.StringIO()
+        writer = csv.DictWriter(expected, fieldnames=list(data[0].keys()))
+        writer.writeheader()
+        writer.writerows(data)
+
+        response = create_inline_response(data, format="csv")
+
+        assert response["data"] == expected.getvalue()
+
+    def test_inline_csv_buffer_reuse(self):
+        """Test that reusing the CSV buffer never leaks output between calls."""
+        long_rows = [{"name": f"Name, {i}", "desc": "x"} for i in range(20)]
+        short_rows = [{"name": "A, B", "desc": "y"}]
+
+        create_inline_response(long_rows, format="csv")
+        response = create_inline_response(short_rows, format="csv")
+
+        assert response["data"] == 'name,desc\r\n"A, B",y\r\n'
+
+    @pytest.mark.parametrize(
+        ("relative", "expected"),
+        [
+            ("out.csv", "out.csv"),
+            ("proj/sub/out.csv", str(Path("proj/sub/out.csv"))),
+            ("../elsewhere/out.csv", "meta/out.csv"),
+        ],
+    )
+    def test_file_reference_relative_path(self, test_config, relative, expected):
+        """Test that file references are relative to client_root when possible."""
+        metadata = FileMetadata(
+            "meta/out.csv", "2024-01-01T00:00:00+00:00", 1, "1 B", "csv", False, 1
+        )
+        filepath = Path(os.path.normpath(test_config.client_root / relative))
+
+        response = create_file_reference_response(filepath, metadata, test_config)
+
+        assert response["filepath"] == expected
+        assert response["filename"] == "out.csv"
+
 
 class TestComponentIntegration:
     """Test that all components work together correctly."""
@@ -583,3 +682,124 @@ class TestLogging:
             message="Test",
             severity="invalid",  # Will be defaulted to warning
         )
+
+    def test_deferred_messages_rendered(self):
+        """Test that template messages and context are filled in when emitted."""
+        from src.integration.logging_config import (
+            get_logger,
+            log_decision,
+            log_performance_metric,
+        )
+
+        logger = get_logger()
+        records = []
+        sink_id = logger.add(lambda msg: records.append(msg.record), level="DEBUG")
+        try:
+            log_decision("automatic", True, 5000, 1000, "Test reason")
+            log_performance_metric("test_metric", 123.45, unit="ms")
+            create_inline_response([{"id": 1}], format="json")
+        finally:
+            logger.remove(sink_id)
+
+        messages = [record["message"] for record in records]
+        assert "Output decision: automatic" in messages
+        assert "Performance: test_metric = 123.45ms" in messages
+        inline = next(r for r in records if r["message"] == "Created inline response")
+        assert inline["extra"]["data_type"] == "list"
+        assert inline["extra"]["row_count"] == 1
+
+    def test_file_records_are_json_lines(self, tmp_path):
+        """Test that the file formatter writes each record as one JSON object."""
+        import orjson
+
+        from src.integration.logging_config import LoggingConfig, get_logger
+
+        logger = get_logger()
+        log_file = tmp_path / "test.log"
+        sink_id = logger.add(log_file, format=LoggingConfig.FILE_FORMAT)
+        try:
+            logger.info("Wrote {name}", name="<out>.csv", path=Path("/tmp/a"), rows={"n": 1})
+        finally:
+            logger.remove(sink_id)
+
+        record = orjson.loads(log_file.read_text().splitlines()[0])
+        assert record["level"] == "INFO"
+        assert record["message"] == "Wrote <out>.csv"
+        assert record["extra"] == {"name": "<out>.csv", "path": "/tmp/a", "rows": {"n": 1}}
+
+    def test_log_enqueue_opt_in(self, monkeypatch):
+        """Test that queued file logging is off unless MCP_LOG_ENQUEUE=1."""
+        from src.integration.logging_config import LoggingConfig
+
+        monkeypatch.delenv("MCP_LOG_ENQUEUE", raising=False)
+        assert LoggingConfig().enqueue is False
+
+        monkeypatch.setenv("MCP_LOG_ENQUEUE", "1")
+        assert LoggingConfig().enqueue is True
+
+    def test_decisions_batched(self, monkeypatch):
+        """Test that decisions are logged together when batching is enabled."""
+        from src.integration import logging_config
+
+        logger = logging_config.get_logger()
+        monkeypatch.setattr(logging_config._config, "decision_batch_size", 3)
+        records = []
+        sink_id = logger.add(lambda msg: records.append(msg.record), level="INFO")
+        try:
+            for i in range(4):
+                logging_config.log_decision("automatic", False, i, 1, "Test reason")
+            batched = list(records)
+            logging_config.flush_decisions()
+        finally:
+            logger.remove(sink_id)
+
+        assert len(batched) == 1
+        assert batched[0]["extra"]["count"] == 3
+        assert [d["token_count"] for d in batched[0]["extra"]["decisions"]] == [0, 1, 2]
+        assert records[-1]["extra"]["decisions"][0]["token_count"] == 3
+
+    def test_handlers_installed_once(self, monkeypatch):
+        """Test that creating another LoggingConfig does not re-add handlers."""
+        from src.integration.logging_config import LoggingConfig, get_logger
+
+        logger = get_logger()
+        assert LoggingConfig._CONFIGURED
+
+        def fail(*_args, **_kwargs):
+            raise AssertionError("handlers should not be re-installed")
+
+        monkeypatch.setattr(logger, "add", fail)
+        monkeypatch.setattr(logger, "remove", fail)
+
+        LoggingConfig()
+
+    def test_is_level_enabled(self, monkeypatch):
+        """Test level checks against the configured minimum level."""
+        from src.integration.logging_config import LoggingConfig, get_logger, is_level_enabled
+
+        logger = get_logger()
+        monkeypatch.setattr(LoggingConfig, "_MIN_LEVEL_NO", logger.level("INFO").no)
+
+        assert is_level_enabled("CRITICAL") is True
+        assert is_level_enabled("ERROR") is True
+        assert is_level_enabled("INFO") is True
+        assert is_level_enabled("DEBUG") is False
+
+    def test_decision_not_logged_when_info_disabled(self, monkeypatch):
+        """Test that should_use_output_helper skips log_decision when INFO is filtered."""
+        import src.integration.helpers as helpers
+
+        def fail_log(**_kwargs):
+            raise AssertionError("log_decision should be skipped")
+
+        monkeypatch.setattr(helpers, "is_level_enabled", lambda _level: False)
+        monkeypatch.setattr(helpers, "log_decision", fail_log)
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            config = OutputConfig.model_construct(
+                client_root=Path(tmpdir), output_token_threshold=1000, output_compression=False
+            )
+            decision = should_use_output_helper([{"id": 1}], config)
+
+        assert decision.use_file is False
+        assert decision.row_count == 1
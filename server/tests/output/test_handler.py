@@ -9,7 +9,9 @@ Tests cover:
 - Integration with OutputConfig and security validation
 """
 
+import csv
 import gzip
+import hashlib
 import json
 import os
 import tempfile
@@ -23,6 +25,7 @@ from src.output.handler import (
     OutputHandler,
     _calculate_checksum,
     _format_size,
+    _retry_operation,
 )
 from src.utils.output_config import OutputConfig
 from src.utils.security import SecurityError
@@ -73,6 +76,31 @@ def test_format_size():
     assert _format_size(1572864) == "1.5 MB"
     assert _format_size(1073741824) == "1.0 GB"
     assert _format_size(1610612736) == "1.5 GB"
+    assert _format_size(1048575) == "1024.0 KB"
+    assert _format_size(2**50) == "1.0 PB"
+    assert _format_size(2**60) == "1024.0 PB"
+
+
+@pytest.mark.asyncio
+async def test_retry_operation_backoff():
+    """Test retries back off exponentially and re-raise the last error."""
+    calls = []
+
+    async def flaky():
+        calls.append(len(calls))
+        if len(calls) < 3:
+            raise OSError(f"attempt {len(calls)}")
+        return "ok"
+
+    with patch("src.output.handler.asyncio.sleep") as sleep:
+        assert await _retry_operation(flaky, max_retries=3, backoff_base=0.5) == "ok"
+    assert [c.args[0] for c in sleep.call_args_list] == [0.5, 1.0]
+
+    calls.clear()
+    with patch("src.output.handler.asyncio.sleep"):
+        with pytest.raises(OSError, match="attempt 2"):
+            await _retry_operation(flaky, max_retries=2)
+    assert len(calls) == 2
 
 
 @pytest.mark.asyncio
@@ -95,6 +123,18 @@ async def test_calculate_checksum(temp_output_dir):
     assert checksum == checksum2
 
 
+@pytest.mark.asyncio
+async def test_calculate_checksum_large_file(temp_output_dir):
+    """Test that checksums of files spanning several read buffers are correct."""
+    test_file = temp_output_dir / "large.bin"
+    content = os.urandom(2 * 1024 * 1024 + 123)
+    test_file.write_bytes(content)
+
+    checksum = await _calculate_checksum(test_file)
+
+    assert checksum == hashlib.sha256(content).hexdigest()
+
+
 # ==============================================================================
 # CSV Writing Tests
 # ==============================================================================
@@ -180,6 +220,32 @@ async def test_write_csv_with_compression(handler, temp_output_dir):
         assert "Alice,30" in content
 
 
+@pytest.mark.asyncio
+async def test_compressed_write_off_event_loop(temp_output_dir):
+    """Test that gzip output is written in a worker thread at the fast level."""
+    import threading
+
+    from src.output import handler as handler_module
+
+    config = OutputConfig(output_compression=True, output_metadata=True)
+    handler = OutputHandler(config)
+    threads = []
+    real_open = handler_module._open_gzip
+
+    def recording_open(*args, **kwargs):
+        threads.append(threading.current_thread())
+        return real_open(*args, **kwargs)
+
+    with patch.object(handler_module, "_open_gzip", recording_open):
+        await handler.write_csv([{"name": "Alice"}], Path("a.csv"), config)
+        await handler.write_json([{"name": "Alice"}], Path("a.json"), config)
+
+    assert len(threads) == 2 and threading.main_thread() not in threads
+    if handler_module._gzip is gzip:
+        # gzip header XFL byte is 4 when the fastest compression level was used
+        assert (temp_output_dir / "a.csv.gz").read_bytes()[8] == 4
+
+
 @pytest.mark.asyncio
 async def test_write_csv_empty_data(handler, test_config):
     """Test error handling for empty data."""
@@ -207,6 +273,37 @@ async def test_write_csv_special_characters(handler, test_config, temp_output_di
     assert metadata.rows == 2
 
 
+@pytest.mark.asyncio
+async def test_write_csv_round_trips_through_csv_reader(handler, test_config, temp_output_dir):
+    """Test that written CSV parses back to the original values across chunks."""
+    data = [{"name": f"Name, {i}", "desc": f'Says "{i}"\nand more', "n": i} for i in range(250)]
+    data.append({"name": "Missing desc"})
+
+    await handler.write_csv(data, Path("roundtrip.csv"), test_config)
+
+    with open(temp_output_dir / "roundtrip.csv", newline="") as f:
+        rows = list(csv.reader(f))
+    assert rows[0] == ["name", "desc", "n"]
+    assert rows[1:-1] == [[r["name"], r["desc"], str(r["n"])] for r in data[:-1]]
+    assert rows[-1] == ["Missing desc", "", ""]
+
+
+@pytest.mark.asyncio
+async def test_write_csv_flushes_across_buffer_boundaries(
+    handler, test_config, temp_output_dir, monkeypatch
+):
+    """Test that output is complete when the write buffer is flushed mid-file."""
+    monkeypatch.setattr("src.output.handler._WRITE_BUFFER_SIZE", 64)
+    data = [{"id": i, "value": f"value_{i}"} for i in range(250)]
+
+    metadata = await handler.write_csv(data, Path("flushed.csv"), test_config)
+
+    content = (temp_output_dir / "flushed.csv").read_bytes()
+    expected = "id,value\n" + "".join(f"{i},value_{i}\n" for i in range(250))
+    assert content == expected.encode()
+    assert metadata.checksum == hashlib.sha256(content).hexdigest()
+
+
 @pytest.mark.asyncio
 async def test_write_csv_creates_parent_directories(handler, test_config, temp_output_dir):
     """Test that parent directories are created automatically."""
@@ -221,6 +318,40 @@ async def test_write_csv_creates_parent_directories(handler, test_config, temp_o
     assert output_file.parent.exists()
 
 
+@pytest.mark.asyncio
+async def test_write_csv_text_verbatim(handler, test_config, temp_output_dir):
+    """Test that raw CSV text is written byte-for-byte, line endings included."""
+    csv_text = "timestamp,open\r\n2024-01-02,101.0\r\n2024-01-01,100.0\r\n"
+
+    filepath = Path("raw.csv")
+    metadata = await handler.write_csv_text(csv_text, 2, filepath, test_config)
+
+    output_file = temp_output_dir / filepath
+    assert output_file.read_bytes() == csv_text.encode()
+    assert metadata.rows == 2
+    assert metadata.format == "csv"
+
+
+@pytest.mark.asyncio
+async def test_write_csv_text_with_compression(temp_output_dir):
+    """Test raw CSV text writing with gzip compression."""
+    config = OutputConfig(output_compression=True, output_metadata=True)
+    handler = OutputHandler(config)
+
+    metadata = await handler.write_csv_text("name,age\nAlice,30\n", 1, Path("raw.csv"), config)
+
+    with gzip.open(temp_output_dir / "raw.csv.gz", "rt", newline="") as f:
+        assert f.read() == "name,age\nAlice,30\n"
+    assert metadata.format == "csv.gz"
+
+
+@pytest.mark.asyncio
+async def test_write_csv_text_empty(handler, test_config):
+    """Test error handling for empty CSV text."""
+    with pytest.raises(ValueError, match="Cannot write empty data"):
+        await handler.write_csv_text("", 0, Path("empty.csv"), test_config)
+
+
 # ==============================================================================
 # JSON Writing Tests
 # ==============================================================================
@@ -310,6 +441,19 @@ async def test_write_json_serialization_error(handler, test_config):
         await handler.write_json(data, Path("invalid.json"), test_config)
 
 
+@pytest.mark.asyncio
+async def test_write_json_matches_stdlib_layout(handler, test_config, temp_output_dir):
+    """Test JSON output keeps the indent=2 layout, including non-string keys and big ints."""
+    data = {"rows": [{"a": 1, "b": "x"}], 1: "one", "big": 2**70}
+
+    filepath = Path("layout.json")
+    await handler.write_json(data, filepath, test_config)
+
+    loaded = json.loads((temp_output_dir / filepath).read_text())
+    assert loaded == json.loads(json.dumps(data))
+    assert (temp_output_dir / filepath).read_text().startswith('{\n  "rows": [\n    {\n')
+
+
 @pytest.mark.asyncio
 async def test_write_json_unicode(handler, test_config, temp_output_dir):
     """Test JSON writing with unicode characters."""
@@ -372,6 +516,58 @@ async def test_generate_metadata_no_checksum(handler, temp_output_dir):
     assert metadata.checksum == ""
 
 
+@pytest.mark.asyncio
+@pytest.mark.parametrize("compress", [False, True])
+@pytest.mark.parametrize("method", ["write_csv", "write_csv_text", "write_json"])
+async def test_checksum_computed_during_write(temp_output_dir, compress, method):
+    """Test that checksums match the written file without reading it back."""
+    config = OutputConfig(output_compression=compress, output_metadata=True)
+    handler = OutputHandler(config)
+    data = [{"name": "Zoë", "note": 'Says "hi", twice'}, {"name": "Bob", "note": ""}]
+    args = {
+        "write_csv": (data, Path("out.csv")),
+        "write_csv_text": ("name,note\r\nBob,\r\n", 1, Path("out.csv")),
+        "write_json": (data, Path("out.json")),
+    }[method]
+
+    with patch(
+        "src.output.handler._calculate_checksum",
+        side_effect=AssertionError("checksum should come from the write"),
+    ):
+        metadata = await getattr(handler, method)(*args, config)
+
+    written = (temp_output_dir / metadata.filepath).read_bytes()
+    assert metadata.checksum == hashlib.sha256(written).hexdigest()
+    if compress:
+        # gzip header still records the original filename, as with gzip.open
+        assert written[3] & 0x08
+        assert gzip.decompress(written)
+
+
+@pytest.mark.asyncio
+async def test_checksum_algo_recorded(temp_output_dir, monkeypatch):
+    """Test that metadata names the algorithm actually used for the checksum."""
+    from src.output import handler as handler_module
+
+    config = OutputConfig(output_checksum_algo="blake3")
+    handler = OutputHandler(config)
+
+    # Without the blake3 package the handler falls back to SHA-256
+    monkeypatch.setattr(handler_module, "_blake3", None)
+    metadata = await handler.write_json({"a": 1}, Path("fallback.json"), config)
+    written = (temp_output_dir / "fallback.json").read_bytes()
+    assert metadata.checksum_algo == "sha256"
+    assert metadata.checksum == hashlib.sha256(written).hexdigest()
+    monkeypatch.undo()
+
+    blake3 = pytest.importorskip("blake3")
+    metadata = await handler.write_json({"a": 1}, Path("fast.json"), config)
+    written = (temp_output_dir / "fast.json").read_bytes()
+    assert metadata.checksum_algo == "blake3"
+    assert metadata.checksum == blake3.blake3(written).hexdigest()
+    assert await _calculate_checksum(temp_output_dir / "fast.json", "blake3") == metadata.checksum
+
+
 @pytest.mark.asyncio
 async def test_generate_metadata_compressed_format(handler, test_config, temp_output_dir):
     """Test metadata format for compressed files."""
@@ -12,6 +12,7 @@ Tests the complete project management workflow including:
 """
 
 import asyncio
+import os
 
 import pytest
 
@@ -215,6 +216,23 @@ class TestListProjectFiles:
         assert files[0].name == "new.csv"
         assert files[2].name == "old.csv"
 
+    async def test_list_project_files_sorted_by_nanoseconds(self, handler):
+        """Test that mtimes closer than float precision still sort correctly."""
+        import os
+
+        project_path = await handler.create_project_folder("ns-sorted")
+        base_ns = 1_700_000_000_000_000_000
+        for offset, name in ((0, "first.csv"), (40, "second.csv")):
+            path = project_path / name
+            path.write_text(name)
+            os.utime(path, ns=(base_ns + offset, base_ns + offset))
+        if (project_path / "second.csv").stat().st_mtime_ns != base_ns + 40:
+            pytest.skip("filesystem lacks nanosecond timestamps")
+
+        files = await handler.list_project_files("ns-sorted")
+
+        assert [f.name for f in files] == ["second.csv", "first.csv"]
+
     async def test_list_project_files_nested_directories(self, handler):
         """Test listing files in nested subdirectories."""
         project_path = await handler.create_project_folder("nested-test")
@@ -233,6 +251,47 @@ class TestListProjectFiles:
         assert "root.csv" in file_names
         assert "subdir/nested.csv" in file_names or "subdir\\nested.csv" in file_names
 
+    async def test_list_project_files_nested_pattern(self, handler):
+        """Test name patterns match at any depth and directory patterns still work."""
+        project_path = await handler.create_project_folder("nested-pattern")
+        subdir = project_path / "subdir"
+        subdir.mkdir()
+        (project_path / "root.csv").write_text("root")
+        (subdir / "nested.csv.gz").write_bytes(b"nested")
+        (subdir / "nested.json").write_text("{}")
+
+        by_name = await handler.list_project_files("nested-pattern", "nested.*")
+        assert {f.name for f in by_name} == {"subdir/nested.csv.gz", "subdir/nested.json"}
+        assert {f.format for f in by_name} == {"csv.gz", "json"}
+
+        by_dir = await handler.list_project_files("nested-pattern", "subdir/*.json")
+        assert [f.name for f in by_dir] == ["subdir/nested.json"]
+
+    async def test_list_project_files_skips_vanished_subdirectory(self, handler, monkeypatch):
+        """Test that a subdirectory removed during the walk is skipped, not fatal."""
+        import shutil
+
+        from src.output import handler as handler_module
+
+        project_path = await handler.create_project_folder("vanished-subdir")
+        subdir = project_path / "subdir"
+        subdir.mkdir()
+        (project_path / "root.csv").write_text("root")
+        (subdir / "nested.csv").write_text("nested")
+
+        real_scandir = os.scandir
+
+        def scandir(path):
+            # Remove the subdirectory after the parent listed it, before it is opened
+            if path == str(subdir):
+                shutil.rmtree(path)
+            return real_scandir(path)
+
+        monkeypatch.setattr(handler_module.os, "scandir", scandir)
+
+        files = await handler.list_project_files("vanished-subdir", "*.csv")
+        assert [f.name for f in files] == ["root.csv"]
+
     async def test_list_project_files_invalid_project_name(self, handler):
         """Test that invalid project names raise ValueError."""
         with pytest.raises(ValueError, match="non-empty string"):
@@ -267,6 +326,21 @@ class TestDeleteProjectFile:
 
         assert deleted is False
 
+    async def test_delete_project_file_symlink_escape(self, handler, tmp_path):
+        """Test that a symlink pointing outside the project is rejected."""
+        from src.utils.security import SecurityError
+
+        project_path = await handler.create_project_folder("symlink-delete")
+        outside = tmp_path.parent / f"{tmp_path.name}-outside.csv"
+        outside.write_text("keep")
+        (project_path / "link.csv").symlink_to(outside)
+
+        with pytest.raises(SecurityError):
+            await handler.delete_project_file("symlink-delete", "link.csv")
+
+        assert outside.exists()
+        outside.unlink()
+
     async def test_delete_project_file_compressed(self, handler):
         """Test deleting compressed files."""
         project_path = await handler.create_project_folder("delete-compressed")
@@ -357,6 +431,18 @@ class TestListProjects:
         assert project.total_size == 300  # 100 + 200
         assert project.last_modified  # Should have a timestamp
 
+    async def test_list_projects_counts_nested_files(self, handler):
+        """Test project stats include files in subfolders but not the subfolders."""
+        project_path = await handler.create_project_folder("nested-stats")
+        (project_path / "top.csv").write_text("x" * 10)
+        (project_path / "2024" / "01").mkdir(parents=True)
+        (project_path / "2024" / "01" / "deep.json").write_text("y" * 20)
+
+        projects = await handler.list_projects()
+
+        assert projects[0].file_count == 2
+        assert projects[0].total_size == 30
+
     async def test_list_projects_excludes_hidden(self, handler, test_output_config):
         """Test that hidden folders (starting with '.') are excluded."""
         # Create regular project
@@ -0,0 +1,278 @@
+"""
+Tests for the shared Alpha Vantage request helper in src/common.py.
+
+HTTP traffic is served by an httpx.MockTransport swapped in for the shared client,
+and MCP_OUTPUT_DIR is unset so requests take the legacy (R2 fallback) path.
+"""
+
+import asyncio
+import os
+
+import httpx
+import pytest
+
+import src.common as common
+from src.context import default_params_context, set_api_key, set_entitlement
+
+
+@pytest.fixture
+def api_responses(monkeypatch):
+    """Route the shared HTTP client through a mock transport and record requests."""
+    requests = []
+    responses = {"body": "timestamp,open\n2024-01-01,100.0\n"}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(200, text=responses["body"])
+
+    monkeypatch.delenv("MCP_OUTPUT_DIR", raising=False)
+    monkeypatch.setattr(
+        common, "_http_client", httpx.Client(transport=httpx.MockTransport(handler))
+    )
+    set_api_key("test-key")
+    return requests, responses
+
+
+class TestMakeApiRequest:
+    """Test suite for _make_api_request."""
+
+    def test_sends_function_and_default_params(self, api_responses):
+        """Test that function, apikey and source are added to the query."""
+        requests, _ = api_responses
+
+        common._make_api_request("TIME_SERIES_DAILY", {"symbol": "IBM"})
+
+        query = requests[0].url.params
+        assert query["function"] == "TIME_SERIES_DAILY"
+        assert query["symbol"] == "IBM"
+        assert query["apikey"] == "test-key"
+        assert query["source"] == "alphavantagemcp"
+
+    def test_context_entitlement_added(self, api_responses):
+        """Test that the context entitlement is sent and removed again on reset."""
+        requests, _ = api_responses
+
+        token = set_entitlement("realtime")
+        try:
+            common._make_api_request("GLOBAL_QUOTE", {"symbol": "IBM"})
+        finally:
+            default_params_context.reset(token)
+        common._make_api_request("GLOBAL_QUOTE", {"symbol": "IBM"})
+
+        assert requests[0].url.params["entitlement"] == "realtime"
+        assert "entitlement" not in requests[1].url.params
+
+    def test_params_entitlement_takes_priority(self, api_responses):
+        """Test that an entitlement in params wins over the context one."""
+        requests, _ = api_responses
+
+        token = set_entitlement("realtime")
+        try:
+            common._make_api_request("GLOBAL_QUOTE", {"symbol": "IBM", "entitlement": "delayed"})
+        finally:
+            default_params_context.reset(token)
+
+        assert requests[0].url.params["entitlement"] == "delayed"
+
+    def test_empty_entitlement_dropped(self, api_responses):
+        """Test that an empty entitlement parameter is not sent."""
+        requests, _ = api_responses
+
+        common._make_api_request("GLOBAL_QUOTE", {"symbol": "IBM", "entitlement": None})
+
+        assert "entitlement" not in requests[0].url.params
+
+    def test_does_not_mutate_params(self, api_responses):
+        """Test that the caller's params dict is left untouched."""
+        params = {"symbol": "IBM"}
+
+        common._make_api_request("TIME_SERIES_DAILY", params)
+
+        assert params == {"symbol": "IBM"}
+
+    def test_small_csv_returned_inline(self, api_responses):
+        """Test that a small CSV response is returned as text."""
+        _, responses = api_responses
+
+        result = common._make_api_request("TIME_SERIES_DAILY", {"symbol": "IBM"})
+
+        assert result == responses["body"]
+
+    def test_small_json_returned_parsed(self, api_responses):
+        """Test that a small JSON response is returned parsed."""
+        _, responses = api_responses
+        responses["body"] = '{"Global Quote": {"01. symbol": "IBM"}}'
+
+        result = common._make_api_request("GLOBAL_QUOTE", {"symbol": "IBM", "datatype": "json"})
+
+        assert result == {"Global Quote": {"01. symbol": "IBM"}}
+
+    def test_reuses_shared_client(self, api_responses):
+        """Test that consecutive calls go through the same shared client."""
+        requests, _ = api_responses
+
+        common._make_api_request("TIME_SERIES_DAILY", {"symbol": "IBM"})
+        common._make_api_request("TIME_SERIES_DAILY", {"symbol": "MSFT"})
+
+        assert len(requests) == 2
+
+    def test_both_force_flags_raise(self, api_responses):
+        """Test that force_inline and force_file are mutually exclusive."""
+        with pytest.raises(ValueError, match="Cannot set both"):
+            common._make_api_request("TIME_SERIES_DAILY", {}, force_inline=True, force_file=True)
+
+    def test_legacy_path_skips_parsing(self, api_responses, monkeypatch):
+        """Test that the legacy path works on raw text without parsing the response."""
+
+        def fail_parse(_text):
+            raise AssertionError("legacy path should not parse the response")
+
+        monkeypatch.setitem(common._PARSERS, "csv", fail_parse)
+        _, responses = api_responses
+
+        assert common._make_api_request("TIME_SERIES_DAILY", {"symbol": "IBM"}) == responses["body"]
+
+    def test_output_dir_parses_csv(self, api_responses, monkeypatch, tmp_path):
+        """Test that with MCP_OUTPUT_DIR set, small CSV is parsed and returned inline."""
+        monkeypatch.setenv("MCP_OUTPUT_DIR", str(tmp_path))
+
+        result = common._make_api_request("TIME_SERIES_DAILY", {"symbol": "IBM"})
+
+        assert result["data"] == "timestamp,open\r\n2024-01-01,100.0\r\n"
+
+    def test_output_dir_passes_through_non_json_text(self, api_responses, monkeypatch, tmp_path):
+        """Test that a non-JSON body for datatype=json is kept as text."""
+        monkeypatch.setenv("MCP_OUTPUT_DIR", str(tmp_path))
+        _, responses = api_responses
+        responses["body"] = "Thank you for using Alpha Vantage!"
+
+        result = common._make_api_request("GLOBAL_QUOTE", {"symbol": "IBM", "datatype": "json"})
+
+        assert result["data"] == "Thank you for using Alpha Vantage!"
+
+    def test_always_inline_skips_decision(self, api_responses, monkeypatch, tmp_path):
+        """Test that known-small endpoints are returned inline without estimation."""
+        monkeypatch.setenv("MCP_OUTPUT_DIR", str(tmp_path))
+        _, responses = api_responses
+        responses["body"] = '{"Global Quote": {"01. symbol": "IBM"}}'
+
+        def fail_decision(**_kwargs):
+            raise AssertionError("output decision should be skipped")
+
+        monkeypatch.setattr(common, "should_use_output_helper", fail_decision)
+
+        result = common._make_api_request("GLOBAL_QUOTE", {"symbol": "IBM", "datatype": "json"})
+
+        assert result["type"] == "inline_data"
+        assert result["data"] == {"Global Quote": {"01. symbol": "IBM"}}
+
+    def test_always_inline_respects_force_file(self, api_responses, monkeypatch, tmp_path):
+        """Test that force_file still writes known-small endpoints to file."""
+        monkeypatch.setenv("MCP_OUTPUT_DIR", str(tmp_path))
+
+        result = common._make_api_request("GLOBAL_QUOTE", {"symbol": "IBM"}, force_file=True)
+
+        assert result["type"] == "file_reference"
+
+    def test_output_config_loaded_once(self, api_responses, monkeypatch, tmp_path):
+        """Test that OutputConfig is reused across calls with the same MCP_OUTPUT_DIR."""
+        monkeypatch.setenv("MCP_OUTPUT_DIR", str(tmp_path))
+        common._make_api_request("TIME_SERIES_DAILY", {"symbol": "IBM"})
+
+        def fail_config():
+            raise AssertionError("OutputConfig should not be rebuilt")
+
+        monkeypatch.setattr(common, "OutputConfig", fail_config)
+        result = common._make_api_request("TIME_SERIES_DAILY", {"symbol": "IBM"})
+
+        assert "data" in result
+
+    def test_output_config_failure_not_cached(self, monkeypatch, tmp_path):
+        """Test that a failed OutputConfig load is retried on the next request."""
+        monkeypatch.setenv("MCP_OUTPUT_DIR", str(tmp_path / "retry"))
+        real_config = common.OutputConfig
+
+        def failing_config():
+            raise ValueError("output directory not ready")
+
+        monkeypatch.setattr(common, "OutputConfig", failing_config)
+        assert common._load_output_config(os.environ["MCP_OUTPUT_DIR"]) == (None, None)
+
+        monkeypatch.setattr(common, "OutputConfig", real_config)
+        config, handler = common._load_output_config(os.environ["MCP_OUTPUT_DIR"])
+
+        assert config is not None
+        assert handler is not None
+
+    def test_force_file_writes_output(self, api_responses, monkeypatch, tmp_path):
+        """Test that force_file writes the CSV response as-is and returns a file reference."""
+        monkeypatch.setenv("MCP_OUTPUT_DIR", str(tmp_path))
+        _, responses = api_responses
+
+        result = common._make_api_request("TIME_SERIES_DAILY", {"symbol": "IBM"}, force_file=True)
+
+        assert result["type"] == "file_reference"
+        assert (tmp_path / result["filename"]).read_text() == responses["body"]
+
+    def test_file_names_unique_within_same_second(self, api_responses, monkeypatch, tmp_path):
+        """Test that back-to-back file outputs get distinct filenames."""
+        monkeypatch.setenv("MCP_OUTPUT_DIR", str(tmp_path))
+        monkeypatch.setattr(common.time, "time", lambda: 1700000000.0)
+
+        first = common._make_api_request("TIME_SERIES_DAILY", {"symbol": "IBM"}, force_file=True)
+        second = common._make_api_request("TIME_SERIES_DAILY", {"symbol": "IBM"}, force_file=True)
+
+        assert first["filename"] != second["filename"]
+        assert len(list(tmp_path.iterdir())) == 2
+
+    async def test_force_file_inside_running_loop(self, api_responses, monkeypatch, tmp_path):
+        """Test that file output works when called from a running event loop."""
+        monkeypatch.setenv("MCP_OUTPUT_DIR", str(tmp_path))
+        asyncio.get_running_loop()
+
+        result = common._make_api_request("TIME_SERIES_DAILY", {"symbol": "IBM"}, force_file=True)
+
+        assert result["type"] == "file_reference"
+
+
+class TestParseCsvToDicts:
+    """Test suite for _parse_csv_to_dicts."""
+
+    def test_rows_keyed_by_header(self):
+        """Test that each row becomes a dict keyed by the header line."""
+        rows = common._parse_csv_to_dicts('timestamp,open\r\n2024-01-02,"1,000.5"\r\n')
+
+        assert rows == [{"timestamp": "2024-01-02", "open": "1,000.5"}]
+
+    def test_blank_lines_skipped(self):
+        """Test that blank lines do not produce rows."""
+        rows = common._parse_csv_to_dicts("a,b\n1,2\n\n3,4\n")
+
+        assert rows == [{"a": "1", "b": "2"}, {"a": "3", "b": "4"}]
+
+    def test_empty_input(self):
+        """Test that empty input yields no rows."""
+        assert common._parse_csv_to_dicts("") == []
+        assert common._parse_csv_to_dicts("a,b\n") == []
+
+
+class TestCreatePreview:
+    """Test suite for _create_preview."""
+
+    def test_samples_first_50_lines(self):
+        """Test that the preview holds the header, first 50 lines and total count."""
+        response_text = "\n".join(["timestamp,open"] + [f"2024-01-{i},{i}" for i in range(120)])
+
+        preview = common._create_preview(response_text, "csv", 60000)
+
+        assert preview["total_lines"] == 121
+        assert preview["headers"] == "timestamp,open"
+        assert preview["sample_data"] == "\n".join(response_text.split("\n")[:50])
+
+    def test_short_response(self):
+        """Test that responses under 50 lines are sampled whole."""
+        preview = common._create_preview("a,b\n1,2\n", "csv", 60000)
+
+        assert preview["total_lines"] == 3
+        assert preview["sample_data"] == "a,b\n1,2\n"
+        assert preview["headers"] == "a,b"
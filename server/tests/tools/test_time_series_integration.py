@@ -127,11 +127,11 @@ class TestGetTimeSeriesIntegration:
     def test_entitlement_parameter_passed_through(self):
         """Test that entitlement parameter is passed through decorator to _make_api_request.
 
-        NOTE: The @tool decorator sets entitlement as a global variable (src.common._current_entitlement)
+        NOTE: The @tool decorator sets entitlement in the request context (src.context.set_entitlement)
         which _make_api_request reads. We skip testing this integration detail since it's handled
         by the decorator framework, not our code.
         """
-        pytest.skip("Entitlement is handled by @tool decorator framework via global variable")
+        pytest.skip("Entitlement is handled by @tool decorator framework via request context")
 
 
 class TestGetTimeSeriesErrorHandling:
@@ -0,0 +1,95 @@
+"""
+Test suite for Lambda request parsing helpers.
+
+Covers API key extraction in parse_token_from_request and category parsing
+in parse_tool_categories_from_request.
+"""
+
+from src.utils import parse_token_from_request, parse_tool_categories_from_request
+
+
+class TestParseTokenFromRequest:
+    """Test suite for parse_token_from_request function."""
+
+    def test_body_takes_priority(self):
+        """Test that an apikey in the JSON body wins over query and header."""
+        event = {
+            "body": '{"apikey": "from-body"}',
+            "queryStringParameters": {"apikey": "from-query"},
+            "headers": {"authorization": "Bearer from-header"},
+        }
+        assert parse_token_from_request(event) == "from-body"
+
+    def test_query_takes_priority_over_header(self):
+        """Test that an apikey query parameter wins over the Authorization header."""
+        event = {
+            "queryStringParameters": {"apikey": "from-query"},
+            "headers": {"authorization": "Bearer from-header"},
+        }
+        assert parse_token_from_request(event) == "from-query"
+
+    def test_empty_query_apikey_falls_back_to_header(self):
+        """Test that an empty apikey query parameter is ignored."""
+        event = {
+            "queryStringParameters": {"apikey": ""},
+            "headers": {"authorization": "Bearer from-header"},
+        }
+        assert parse_token_from_request(event) == "from-header"
+
+    def test_lowercase_and_titlecase_headers(self):
+        """Test that both header spellings are accepted."""
+        assert parse_token_from_request({"headers": {"authorization": "Bearer abc"}}) == "abc"
+        assert parse_token_from_request({"headers": {"Authorization": "Bearer abc"}}) == "abc"
+
+    def test_non_bearer_scheme_ignored(self):
+        """Test that non-Bearer Authorization headers yield no token."""
+        assert parse_token_from_request({"headers": {"authorization": "Basic abc"}}) == ""
+
+    def test_missing_or_null_fields(self):
+        """Test that None headers and query parameters are handled."""
+        event = {"headers": None, "queryStringParameters": None, "body": None}
+        assert parse_token_from_request(event) == ""
+        assert parse_token_from_request({}) == ""
+
+    def test_invalid_json_body_ignored(self):
+        """Test that a non-JSON body falls through to other sources."""
+        event = {"body": "not json", "headers": {"authorization": "Bearer abc"}}
+        assert parse_token_from_request(event) == "abc"
+
+
+class TestParseToolCategoriesFromRequest:
+    """Test suite for parse_tool_categories_from_request function."""
+
+    def test_query_categories(self):
+        """Test that comma-separated query categories are stripped and filtered."""
+        event = {"path": "/mcp", "queryStringParameters": {"categories": " forex, ,crypto "}}
+        assert parse_tool_categories_from_request(event) == ["forex", "crypto"]
+
+    def test_blank_query_categories(self):
+        """Test that a query value with only separators yields None."""
+        event = {"path": "/mcp", "queryStringParameters": {"categories": " , "}}
+        assert parse_tool_categories_from_request(event) is None
+
+    def test_root_paths(self):
+        """Test that root MCP paths carry no category."""
+        for path in ("", "/", "/mcp"):
+            assert parse_tool_categories_from_request({"path": path}) is None
+        assert parse_tool_categories_from_request({}) is None
+
+    def test_mcp_category_path(self):
+        """Test that /mcp/<category> yields the second segment."""
+        assert parse_tool_categories_from_request({"path": "/mcp/forex"}) == ["forex"]
+        assert parse_tool_categories_from_request({"path": "/mcp/forex/extra"}) == ["forex"]
+
+    def test_direct_category_path(self):
+        """Test the backwards-compatible /<category> form."""
+        assert parse_tool_categories_from_request({"path": "/forex"}) == ["forex"]
+        assert parse_tool_categories_from_request({"path": "//forex"}) == ["forex"]
+
+    def test_mcp_with_trailing_slash(self):
+        """Test that /mcp/ with an empty second segment yields None."""
+        assert parse_tool_categories_from_request({"path": "/mcp/"}) is None
+
+    def test_openai_paths_ignored(self):
+        """Test that OpenAI Actions paths are not parsed as categories."""
+        assert parse_tool_categories_from_request({"path": "/openai/forex"}) is None
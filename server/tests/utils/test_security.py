@@ -287,6 +287,18 @@ class TestFilenameSanitization:
         # Reserved name + dangerous chars
         assert sanitize_filename("CON:*?") == "CON_file"
 
+    def test_repeated_names_are_memoized(self):
+        """Test that repeat calls hit the cache and non-strings still fall back."""
+        from src.utils.security import _sanitize_filename
+
+        _sanitize_filename.cache_clear()
+        assert sanitize_filename("../proj") == "proj"
+        assert sanitize_filename("../proj") == "proj"
+        assert _sanitize_filename.cache_info().hits == 1
+
+        # Unhashable inputs never reach the cache
+        assert sanitize_filename(["proj"]) == "unnamed_file"
+
 
 class TestPermissionChecking:
     """Test suite for check_directory_permissions function."""
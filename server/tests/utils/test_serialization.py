@@ -0,0 +1,33 @@
+"""
+Test suite for JSON serialization helpers.
+"""
+
+import json
+
+import pytest
+
+from src.utils.serialization import json_dumps
+
+
+class TestJsonDumps:
+    """Test suite for json_dumps function."""
+
+    def test_returns_str(self):
+        """Test that the result is a str suitable for a Lambda response body."""
+        result = json_dumps({"error": "invalid_request"})
+        assert isinstance(result, str)
+        assert json.loads(result) == {"error": "invalid_request"}
+
+    def test_unicode_round_trip(self):
+        """Test that non-ASCII text survives serialization."""
+        data = {"description": "Société Générale — 株式"}
+        assert json.loads(json_dumps(data)) == data
+
+    def test_non_str_keys(self):
+        """Test that non-str dict keys are accepted like stdlib json."""
+        assert json.loads(json_dumps({1: "a", 2.5: "b"})) == {"1": "a", "2.5": "b"}
+
+    def test_unserializable_raises_type_error(self):
+        """Test that unsupported objects raise TypeError."""
+        with pytest.raises(TypeError):
+            json_dumps({"value": object()})
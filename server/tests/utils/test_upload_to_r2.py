@@ -0,0 +1,58 @@
+"""
+Test suite for upload_to_r2 client reuse.
+
+boto3 is replaced by a stub module so no network or credentials are needed.
+"""
+
+import sys
+import types
+
+import pytest
+
+import src.utils as utils
+
+
+@pytest.fixture
+def fake_boto3(monkeypatch):
+    """Install a stub boto3 that records client creation and uploads."""
+    calls = {"clients": 0, "puts": []}
+
+    class FakeClient:
+        def put_object(self, **kwargs):
+            calls["puts"].append(kwargs)
+
+    def client(*_args, **_kwargs):
+        calls["clients"] += 1
+        return FakeClient()
+
+    monkeypatch.setitem(sys.modules, "boto3", types.SimpleNamespace(client=client))
+    monkeypatch.setenv("R2_PUBLIC_DOMAIN", "https://r2.example.com")
+    monkeypatch.delenv("R2_BUCKET", raising=False)
+    utils._get_r2_client.cache_clear()
+    yield calls
+    utils._get_r2_client.cache_clear()
+
+
+class TestUploadToR2:
+    """Test suite for upload_to_r2 function."""
+
+    def test_client_created_once(self, fake_boto3):
+        """Test that repeated uploads reuse one R2 client."""
+        utils.upload_to_r2("first")
+        utils.upload_to_r2("second")
+
+        assert fake_boto3["clients"] == 1
+        assert len(fake_boto3["puts"]) == 2
+
+    def test_returns_public_url(self, fake_boto3):
+        """Test that the URL combines the public domain and object key."""
+        url = utils.upload_to_r2("data")
+
+        assert url.startswith("https://r2.example.com/alphavantage-responses/")
+        assert fake_boto3["puts"][0]["Bucket"] == "alphavantage-mcp-responses"
+
+    def test_bucket_override(self, fake_boto3):
+        """Test that an explicit bucket name wins over the environment default."""
+        utils.upload_to_r2("data", bucket_name="custom")
+
+        assert fake_boto3["puts"][0]["Bucket"] == "custom"